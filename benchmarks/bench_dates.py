@@ -0,0 +1,46 @@
+"""
+Benchmark of the publish date parser.
+Compares dateparser.parse with the fast-path DateParser on a corpus of date strings as they
+appear on Senegalese listing sites, and reports the hit rate of the precompiled patterns.
+Usage:
+    python benchmarks/bench_dates.py [number]
+"""
+import sys
+from os import path
+from timeit import timeit
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src')]
+import dateparser  # noqa: E402
+from falcon.Dates import DateParser  # noqa: E402
+CORPUS = [
+    'il y a 3 heures', 'il y a 12 minutes', 'il y a une heure', 'il y a 2 jours', 'il y a 1 semaine',
+    "Aujourd'hui 14:05", "Aujourd’hui à 09h30", 'Hier, 10:49', 'Hier à 18h', 'Avant-hier 07:15',
+    '12 mars 2024', '1er avril 2024', '3 janv. 2024 à 11h20', 'Sam. 9 mars 2024', '25 décembre 2023',
+    '2024-03-12T10:00:00Z', '2024-03-12T10:00:00+00:00', '2024-03-12 10:00:00', '2024-03-12',
+    '5 minutes ago', 'an hour ago', 'Yesterday 21:40', 'Today at 8:05', 'March 12, 2024',
+    '12/03/2024', 'il y a 2 mois',
+]
+def run(number: int = 20) -> dict:
+    """
+    Times the parsing of the corpus with dateparser and with the fast-path parser.
+    Args:
+        number (int): The number of times the corpus is parsed per measure.
+    Returns:
+        dict: The time per date string, in seconds, for each parser, and the fast-path hit rate.
+    """
+    fast = DateParser()
+    def with_dateparser():
+        return [dateparser.parse(value) for value in CORPUS]
+    def with_fast_path():
+        return [fast.parse(value) for value in CORPUS]
+    with_fast_path()
+    timings = {func.__name__: timeit(func, number=number) / number / len(CORPUS)
+               for func in [with_dateparser, with_fast_path]}
+    timings['hit_rate'] = fast.hit_rate
+    return timings
+if __name__ == '__main__':
+    timings = run(*map(int, sys.argv[1:]))
+    for name in ['with_dateparser', 'with_fast_path']:
+        print(f'{name:>16}: {timings[name] * 1e6:9.1f} us/date')
+    print(f"{'speedup':>16}: {timings['with_dateparser'] / timings['with_fast_path']:9.1f}x")
+    print(f"{'hit rate':>16}: {timings['hit_rate']:9.1%}")
@@ -0,0 +1,52 @@
+"""
+Benchmark of the contact phone extraction.
+Compares the PHONE regex of the former Contact.fmethod with the linear phone scanner, on contact
+hrefs as found on listing cards and on long href blobs.
+Usage:
+    python benchmarks/bench_phones.py [number]
+"""
+import re
+import sys
+from os import path
+from timeit import timeit
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src')]
+from falcon.Phones import numbers  # noqa: E402
+from falcon.utils import PHONE, ravel  # noqa: E402
+HREFS = [
+    ['tel:221787320433', 'whatsapp:221787320433', 'whatsapp:phone=221007320433?message=...'],
+    ['tel:+221 77 123 45 67', 'sms:+221771234567'],
+    ['tel:00221-78-123-45-67'],
+]
+BLOB = [[
+    f'whatsapp://send?phone=22177{ix:07d}&text=Bonjour, votre annonce du 12 03 2024 a 100 000 FCFA '
+    'est-elle toujours disponible ? ' * 4 for ix in range(20)]]
+NOISE = [['tel:' + '12-34 ' * 2000]]
+def legacy(value) -> str:
+    """
+    Formats contact information the way the former Contact.fmethod did.
+    Args:
+        value: The contact hrefs.
+    Returns:
+        str: The phone numbers, joined by ';'.
+    """
+    return re.sub(r'[\s\-\+]', '', ';'.join(set(re.findall(PHONE, ravel(value)))))
+def run(number: int = 2000) -> dict:
+    """
+    Times the extraction of the numbers of each corpus with both implementations.
+    Args:
+        number (int): The number of times each corpus is scanned per measure.
+    Returns:
+        dict: The time per value, in seconds, for each implementation and corpus.
+    """
+    timings = {}
+    for corpus, values in [('hrefs', HREFS), ('blob', BLOB), ('noise', NOISE)]:
+        for name, func in [('regex', legacy), ('scanner', lambda value: ';'.join(numbers(value)))]:
+            timings[corpus, name] = timeit(lambda: [func(value) for value in values], number=number) / number / len(values)
+    return timings
+if __name__ == '__main__':
+    timings = run(*map(int, sys.argv[1:]))
+    for corpus in ['hrefs', 'blob', 'noise']:
+        for name in ['regex', 'scanner']:
+            print(f'{corpus:>6} {name:>8}: {timings[corpus, name] * 1e6:9.1f} us/value')
+        print(f"{corpus:>6} {'speedup':>8}: {timings[corpus, 'regex'] / timings[corpus, 'scanner']:9.1f}x")
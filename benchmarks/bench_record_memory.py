@@ -0,0 +1,65 @@
+"""
+Benchmark of the memory held by buffered item records.
+Measures, with tracemalloc, the memory of N buffered MainItem records in the legacy layout
+(a dataclass type built per item, its instance, the asdict OrderedDict and a MappedData wrapper
+keeping the full field list) and in the compact MappedData layout. Field values are shared
+between both runs so that only the record overhead is compared.
+Usage:
+    python benchmarks/bench_record_memory.py [items]
+"""
+import gc
+import sys
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import asdict, make_dataclass
+from datetime import datetime
+from os import path
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src')]
+from falcon.Records import MappedData  # noqa: E402
+NAMES = ['ProductTitle', 'VendorLocation', 'PublishDate', 'Contact', 'PublishLink', 'ProductPrice']
+class LegacyMappedData:
+    """
+    The record layout before compact records: one dataclass type per item, defaults holding the values.
+    """
+    def __init__(self, name, fields):
+        self.name = name
+        self.fields = fields
+        self.dataclass = make_dataclass(self.name, self.fields)()
+        self.cached_dict = asdict(self.dataclass, dict_factory=OrderedDict)
+def values(items: int) -> list:
+    """
+    Builds the field values of the records, distinct per item.
+    Args:
+        items (int): The number of records.
+    Returns:
+        list: One list of (name, type, value) tuples per record.
+    """
+    created_at = datetime.now().isoformat()
+    return [
+        [(name, 'str', f'{name} {ix}') for name in NAMES] + [('CreatedAt', datetime, created_at)]
+        for ix in range(items)]
+def measure(recordclass, fields: list) -> int:
+    """
+    Returns the memory allocated to build and buffer one record per item.
+    Args:
+        recordclass: The record class.
+        fields (list): One list of (name, type, value) tuples per record.
+    Returns:
+        int: The allocated memory, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    buffered = [recordclass('MainItem', item) for item in fields]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del buffered
+    return size
+if __name__ == '__main__':
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    fields = values(items)
+    MappedData('MainItem', fields[0])
+    sizes = {'legacy': measure(LegacyMappedData, fields), 'compact': measure(MappedData, fields)}
+    for name, size in sizes.items():
+        print(f'{name:>8}: {size / 2 ** 20:8.1f} MiB per {items} items, {size / items:7.0f} B/item')
+    print(f"{'ratio':>8}: {sizes['legacy'] / sizes['compact']:8.1f}x")
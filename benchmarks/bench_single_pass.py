@@ -0,0 +1,52 @@
+"""
+Benchmark of single-pass multi-field extraction.
+Compares one XPath evaluation per field with the single tagged XPath evaluation of
+XPathCache.split, on a listing page built from the listing card fixture. The extraction
+timings leave formatting out; the parse timings cover the whole of MainItem.parse.
+Usage:
+    python benchmarks/bench_single_pass.py [cards] [number]
+"""
+import sys
+from os import path
+from timeit import repeat
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src'), path.join(ROOT, 'benchmarks')]
+from parsel import Selector  # noqa: E402
+from falcon.Item import MainItem  # noqa: E402
+from falcon.Page import MainPage  # noqa: E402
+from falcon.XPaths import XPathCache  # noqa: E402
+from falcon.utils import getall  # noqa: E402
+from fixtures import html  # noqa: E402
+def run(cards: int = 50, number: int = 20) -> dict:
+    """
+    Times the extraction of every card of a listing page in both modes.
+    Args:
+        cards (int): The number of cards on the listing page.
+        number (int): The number of times the page is processed per measure.
+    Returns:
+        dict: The best time per page, in seconds, for each measure.
+    """
+    page = MainPage(Selector(text=f'<html><body>{html * cards}</body></html>'))
+    registry = MainItem.project()
+    def extract_per_field():
+        return [[getall(XPathCache.get(field(card), 'relative_xpaths')(card)) for field in registry]
+                for card in page.page_items]
+    def extract_single_pass():
+        return [[getall(out) for out, _ in XPathCache.split(registry, 'relative_xpaths', card)]
+                for card in page.page_items]
+    def parse_per_field():
+        return [MainItem.parse(card, 'relative_value') for card in page.page_items]
+    def parse_single_pass():
+        return [MainItem.parse(card, 'relative_value', single_pass=True) for card in page.page_items]
+    assert extract_per_field() == extract_single_pass()
+    return {
+        func.__name__: min(repeat(func, number=number, repeat=5)) / number
+        for func in [extract_per_field, extract_single_pass, parse_per_field, parse_single_pass]
+    }
+if __name__ == '__main__':
+    timings = run(*map(int, sys.argv[1:]))
+    for name, seconds in timings.items():
+        print(f'{name:>20}: {seconds * 1000:8.2f} ms/page')
+    for step in ['extract', 'parse']:
+        speedup = timings[f'{step}_per_field'] / timings[f'{step}_single_pass']
+        print(f"{step + ' speedup':>20}: {speedup:8.2f}x")
@@ -0,0 +1,58 @@
+"""
+Benchmark of the transport of pages to the parse workers.
+Compares a plain pickle-based multiprocessing Pool.map, as prototyped in
+notebooks/multiprocessing.ipynb, with the ParsePool sending pickled bodies and with the ParsePool
+writing bodies to shared memory. Both ParsePool transports return the records of a page as one
+binary batch, where the plain pool pickles every record.
+Usage:
+    python benchmarks/bench_transport.py [workers] [pages] [cards]
+"""
+import sys
+from os import path
+from time import perf_counter
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src'), path.join(ROOT, 'benchmarks')]
+import multiprocessing  # noqa: E402
+from parsel import Selector  # noqa: E402
+from falcon.Page import MainPage  # noqa: E402
+from falcon.Workers import ParsePool, warm_up  # noqa: E402
+from fixtures import html  # noqa: E402
+def parse(body: bytes) -> list:
+    """
+    Parses a page body into records, the way a plain pool worker does.
+    Args:
+        body (bytes): The HTML body of the page.
+    Returns:
+        list: The MappedData records of the page.
+    """
+    return list(MainPage(Selector(text=body.decode())))
+def run(workers: int = 2, pages: int = 100, cards: int = 300) -> dict:
+    """
+    Times the parsing of the same pages through each transport.
+    Args:
+        workers (int): The number of workers.
+        pages (int): The number of pages.
+        cards (int): The number of cards per page.
+    Returns:
+        dict: The size of a body, in bytes, and the time per page, in seconds, of each transport.
+    """
+    body = f'<html><body>{html * cards}</body></html>'.encode()
+    warm_up()
+    timings = {'body_size': len(body)}
+    with multiprocessing.get_context('fork').Pool(workers) as pool:
+        pool.map(parse, [body] * workers)
+        start = perf_counter()
+        pool.map(parse, [body] * pages)
+        timings['pickle_pool_map'] = (perf_counter() - start) / pages
+    for name, shared in [('parse_pool_pickle', False), ('parse_pool_shared_memory', True)]:
+        with ParsePool(workers, shared_memory=shared) as pool:
+            pool.map([(body, '')] * workers)
+            start = perf_counter()
+            pool.map([(body, '')] * pages)
+            timings[name] = (perf_counter() - start) / pages
+    return timings
+if __name__ == '__main__':
+    timings = run(*map(int, sys.argv[1:]))
+    print(f"{'body size':>25}: {timings.pop('body_size') / 1024:7.0f} kB")
+    for name, timing in timings.items():
+        print(f'{name:>25}: {timing * 1e3:7.2f} ms/page')
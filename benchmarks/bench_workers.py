@@ -0,0 +1,70 @@
+"""
+Benchmark of the pre-fork parse pool.
+Starts a ParsePool with the 'fork' and the 'spawn' start methods, each in a fresh interpreter,
+and reports the time from interpreter start to the first parsed page and the memory of each
+worker: its resident set (RSS), its proportional share (PSS) and its private memory (USS).
+Forked workers share the warmed-up parser state with the parent, so their private memory is
+what they allocated on their own. Memory figures are read from /proc and need Linux.
+Usage:
+    python benchmarks/bench_workers.py [workers] [cards]
+"""
+from time import perf_counter
+START = perf_counter()
+import json  # noqa: E402
+import subprocess  # noqa: E402
+import sys  # noqa: E402
+from os import path  # noqa: E402
+ROOT = path.dirname(path.dirname(path.realpath(__file__)))
+sys.path[:0] = [path.join(ROOT, 'src'), path.join(ROOT, 'benchmarks')]
+def memory(pid: int) -> dict:
+    """
+    Reads the memory of a process.
+    Args:
+        pid (int): The process id.
+    Returns:
+        dict: The RSS, PSS and USS of the process, in kB.
+    """
+    with open(f'/proc/{pid}/smaps_rollup') as smaps:
+        values = {line.split(':')[0]: int(line.split()[1]) for line in smaps if line.split()[-1] == 'kB'}
+    return {'rss': values['Rss'], 'pss': values['Pss'], 'uss': values['Private_Clean'] + values['Private_Dirty']}
+def measure(start_method: str, workers: int, cards: int) -> dict:
+    """
+    Starts a pool and parses one page per worker, in the current interpreter.
+    Args:
+        start_method (str): The multiprocessing start method.
+        workers (int): The number of workers.
+        cards (int): The number of cards on the page.
+    Returns:
+        dict: The time to the first page, in seconds, and the mean memory of a worker, in kB.
+    """
+    from falcon.Workers import ParsePool
+    from fixtures import html
+    body = f'<html><body>{html * cards}</body></html>'
+    with ParsePool(workers, start_method=start_method) as pool:
+        pool.parse(body)
+        first = perf_counter() - START
+        pool.map([(body, '')] * workers * 4)
+        usage = [memory(pid) for pid in pool.pids]
+    return {'first_page': first, **{key: sum(use[key] for use in usage) / len(usage) for key in usage[0]}}
+def run(workers: int = 2, cards: int = 50) -> dict:
+    """
+    Measures each start method in a fresh interpreter.
+    Args:
+        workers (int): The number of workers.
+        cards (int): The number of cards on the page.
+    Returns:
+        dict: The measures of each start method.
+    """
+    return {
+        start_method: json.loads(subprocess.run(
+            [sys.executable, __file__, start_method, str(workers), str(cards)],
+            capture_output=True, text=True, check=True).stdout)
+        for start_method in ['fork', 'spawn']}
+if __name__ == '__main__':
+    if sys.argv[1:2] in (['fork'], ['spawn']):
+        print(json.dumps(measure(sys.argv[1], *map(int, sys.argv[2:]))))
+    else:
+        for start_method, measures in run(*map(int, sys.argv[1:])).items():
+            print(f"{start_method:>6}: first page {measures['first_page'] * 1e3:7.0f} ms, "
+                  f"per worker RSS {measures['rss'] / 1024:6.1f} MB, PSS {measures['pss'] / 1024:6.1f} MB, "
+                  f"USS {measures['uss'] / 1024:6.1f} MB")
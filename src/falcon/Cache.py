@@ -0,0 +1,86 @@
+"""
+Module for caching formatted values.
+Formatters whose values repeat across cards and pages, e.g. locations or relative dates, can
+share a FormatCache so each distinct raw value is formatted once (see Formatter.cache).
+Classes:
+    FormatCache: Bounded LRU/TTL cache of formatted values.
+Example:
+    >>> ProductPrice.cache = FormatCache(maxsize=10000)
+    >>> PublishDate.cache, PublishDate.cache_bucket = FormatCache(ttl=3600), 60
+"""
+from collections import OrderedDict
+from time import monotonic
+import threading
+class FormatCache:
+    """
+    Bounded LRU/TTL cache of formatted values, safe to share across threads.
+    Attributes:
+        maxsize (int): The maximum number of cached values.
+        ttl (float): The number of seconds a value stays valid, None for no expiry.
+        hits (int): The number of values served from the cache.
+        misses (int): The number of values formatted and cached.
+        evictions (int): The number of values evicted to respect maxsize.
+    Methods:
+        get: Returns the cached value of a key, formatting and caching it on a miss.
+        stats: Property returning the cache statistics.
+        clear: Empties the cache and resets its statistics.
+    """
+    def __init__(self, maxsize: int = 4096, ttl: float = None) -> None:
+        """
+        Initializes a FormatCache.
+        Args:
+            maxsize (int, optional): The maximum number of cached values. Defaults to 4096.
+            ttl (float, optional): The number of seconds a value stays valid. Defaults to None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+    def get(self, key, func, value):
+        """
+        Returns the cached value of a key, formatting and caching it on a miss.
+        Args:
+            key: The cache key.
+            func: The formatting function.
+            value: The raw value passed to func on a miss.
+        Returns:
+            Any: The formatted value.
+        """
+        now = monotonic()
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._values.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+        res = func(value)
+        with self._lock:
+            self.misses += 1
+            self._values[key] = (res, None if self.ttl is None else now + self.ttl)
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self.evictions += 1
+        return res
+    @property
+    def stats(self) -> dict:
+        """
+        Property returning the cache statistics.
+        Returns:
+            dict: The hits, misses, evictions, size and hit rate of the cache.
+        """
+        with self._lock:
+            total = self.hits + self.misses
+            return {'hits': self.hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'size': len(self._values),
+                    'hit_rate': self.hits / total if total else 0.0}
+    def clear(self) -> None:
+        """
+        Empties the cache and resets its statistics.
+        """
+        with self._lock:
+            self._values.clear()
+            self.hits = self.misses = self.evictions = 0
@@ -0,0 +1,91 @@
+"""
+Module for generating the extraction functions of items.
+The fields of an item are turned into the source of one function taking a card element, with the
+compiled XPaths and formatting methods bound as its globals. Code objects are cached in memory
+and marshalled to disk, keyed by the hash of the configuration files and of the extraction plan,
+which is computed before any source is generated.
+Functions:
+    build_extractor: Generates, caches and loads the extraction function of fields.
+Example:
+    >>> extract = build_extractor('MainItem', MainItem.project(), {}, 'relative_xpaths', namespace,
+    ...                           MainItem.compile_dir, MainItem._extractors)
+"""
+from os import getpid, makedirs, path, replace
+import hashlib
+import importlib.util
+import marshal
+from .XPaths import XPathCache
+from .utils import conf_hash
+def build_extractor(name: str, registry: list, kept: dict, paths: str, namespace: dict,
+                    compile_dir: str, extractors: dict) -> callable:
+    """
+    Generates, caches and loads the extraction function of fields.
+    Args:
+        name (str): The name of the item class, shown in tracebacks.
+        registry (list): The Field classes to extract.
+        kept (dict): The kept alternatives of a site profile, by '<Class>:<paths>' key.
+        paths (str): The paths relative to a card.
+        namespace (dict): The globals of the function: '_getall', '_ParseError', '_warning', '_now' and
+            '_skipped', the counter of the skipped alternatives or None.
+        compile_dir (str): The directory code objects are marshalled to.
+        extractors (dict): The code objects cached in memory, by digest.
+    Returns:
+        callable: The extraction function, with the names of its values in its 'fields' attribute.
+    """
+    namespace['_first'] = XPathCache.first
+    counted = namespace.get('_skipped') is not None
+    plan = []
+    for ix, field in enumerate(registry):
+        instance = field(None)
+        key_kept = kept.get(f'{field.__name__}:{paths}')
+        namespace[f'_f{ix}'] = instance.fmethod
+        if field.first_match:
+            alternatives = XPathCache.alternatives(instance, paths)
+            namespace[f'_x{ix}'] = tuple(alternatives[jx] for jx in key_kept or range(len(alternatives)))
+            namespace[f'_n{ix}'] = len(alternatives)
+        else:
+            namespace[f'_x{ix}'] = (
+                XPathCache.subset(instance, paths, tuple(sorted(key_kept))) if key_kept
+                else XPathCache.get(instance, paths))
+        plan.append((field.__name__, field.first_match, getattr(instance, paths), key_kept))
+    digest = hashlib.sha256(repr((
+        importlib.util.MAGIC_NUMBER,
+        sorted({conf_hash(field._conf_file) for field in registry if hasattr(field, '_conf_file')}),
+        paths, plan, counted)).encode()).hexdigest()
+    code = extractors.get(digest)
+    cache_file = path.join(compile_dir, f'{digest}.marshal')
+    if code is None and path.exists(cache_file):
+        with open(cache_file, 'rb') as compiled_file:
+            try:
+                # The cache directory belongs to the user, as does the configuration the code is generated from.
+                code = marshal.load(compiled_file)  # nosec B302 - code objects marshalled by build_extractor
+            except (EOFError, ValueError, TypeError):
+                code = None
+    if code is None:
+        # The source is only generated on a cache miss, warm starts load the code object.
+        lines = ['def extract(card):']
+        for ix, field in enumerate(registry):
+            if field.first_match:
+                lines.append(f'    r{ix}, s{ix} = _first(_x{ix}, card, _n{ix})')
+                if counted:
+                    lines.append(f"    _skipped['{field.__name__}'] += s{ix}")
+            else:
+                lines.append(f'    r{ix} = _x{ix}(card)')
+            lines += [
+                f'    r{ix} = _getall(r{ix})',
+                '    try:',
+                f'        v{ix} = _f{ix}(r{ix})',
+                '    except _ParseError:',
+                f"        _warning('failed parsing %s' % r{ix})",
+                f"        v{ix} = ''"]
+        lines.append(f"    return ({''.join(f'v{ix}, ' for ix in range(len(registry)))}_now().isoformat())")
+        code = compile('\n'.join(lines), f'<falcon {name} extractor {digest[:12]}>', 'exec')
+        makedirs(compile_dir, exist_ok=True)
+        with open(f'{cache_file}.{getpid()}', 'wb') as compiled_file:
+            marshal.dump(code, compiled_file)
+        replace(f'{cache_file}.{getpid()}', cache_file)
+    extractors[digest] = code
+    exec(code, namespace)  # nosec B102 - the code is generated from the extraction plan
+    extract = namespace['extract']
+    extract.fields = [field.__name__ for field in registry] + ['CreatedAt']
+    return extract
@@ -35,9 +35,7 @@ Example:
     # Get tel id
     tel_id = redis_user_instance.tel_id("1234567890")
 """
-import redis
 from .Model import Cursor
-from .utils import flatten_dict
 class Redis(Cursor):
     """Cursor object for Redis operations."""
     def __init__(self,
@@ -65,6 +63,7 @@ class Redis(Cursor):
         self.domain = domain
         self.category = category
         self.partition = partition
+        import redis
         self.engine = redis.Redis(**kwargs)
     @property
     def pattern(self):
@@ -79,13 +78,14 @@ class Redis(Cursor):
         """Get id."""
         return f'{self.pattern}:{self.incr}'
     def pipe(self, data):
-        """Pipe data."""
-        return flatten_dict(data.to_dict())
+        """Pipe data, as a copy of the flat mapping of the record, without the missing values."""
+        return {key: value for key, value in data.to_flat().items() if value is not None}
     def push(self, result):
         """Push data."""
         self.engine.hset(self.id, mapping=self.pipe(result))
 class RedisUser(Redis):
-    """Cursor object for Redis operations specific to users."""
+    """Cursor object for Redis operations specific to users, keyed by the Contact and ProductTitle of the items."""
+    required_fields = ('Contact', 'ProductTitle')
     def users_pattern(self, tel):
         """Get users pattern."""
         return ':'.join([
@@ -2,6 +2,7 @@
 Module for managing CSS configurations.
 Classes:
     MainCss: A class for managing main CSS configurations.
+The CSS configuration file is frozen into the extraction plan when this module is imported.
 """
 from functools import cached_property
 from .Model import Config
@@ -24,3 +25,4 @@ class MainCss(Config):
             list: A list of valid CSS attributes.
         """
         return self.css
+MainCss.plan()
@@ -0,0 +1,189 @@
+"""
+Module for parsing the publish dates of listings.
+Most dates found on listing cards come in a handful of shapes, which are recognized by
+precompiled patterns before falling back to dateparser:
+    relative: 'il y a 3 heures', 'il y a une minute', '5 minutes ago'
+    day: "Aujourd'hui 14:05", 'Hier, 10:49', 'Yesterday at 9:30'
+    absolute: '12 mars 2024', '12 mars 2024 à 14h05', 'March 12, 2024'
+    iso: '2024-03-12T10:00:00Z', as found in data-bs-content attributes
+Classes:
+    DateParser: Fast-path date parser with a dateparser fallback.
+Attributes:
+    date_parser (DateParser): The date parser shared by the fields.
+Example:
+    >>> date_parser.parse('Hier, 10:49')
+    datetime.datetime(2024, 3, 11, 10, 49)
+    >>> date_parser.hit_rate
+    1.0
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+import re
+import threading
+UNITS = {
+    'seconds': ['s', 'sec', 'secs', 'seconde', 'secondes', 'second', 'seconds'],
+    'minutes': ['min', 'mins', 'mn', 'minute', 'minutes'],
+    'hours': ['h', 'hr', 'hrs', 'heure', 'heures', 'hour', 'hours'],
+    'days': ['j', 'jour', 'jours', 'day', 'days'],
+    'weeks': ['sem', 'semaine', 'semaines', 'week', 'weeks'],
+}
+UNITS = {alias: unit for unit, aliases in UNITS.items() for alias in aliases}
+MONTHS = {
+    1: ['janvier', 'janv', 'jan', 'january'],
+    2: ['février', 'fevrier', 'févr', 'fevr', 'fév', 'fev', 'february', 'feb'],
+    3: ['mars', 'mar', 'march'],
+    4: ['avril', 'avr', 'april', 'apr'],
+    5: ['mai', 'may'],
+    6: ['juin', 'june', 'jun'],
+    7: ['juillet', 'juil', 'july', 'jul'],
+    8: ['août', 'aout', 'august', 'aug'],
+    9: ['septembre', 'sept', 'sep', 'september'],
+    10: ['octobre', 'oct', 'october'],
+    11: ['novembre', 'nov', 'november'],
+    12: ['décembre', 'decembre', 'déc', 'dec', 'december'],
+}
+MONTHS = {alias: month for month, aliases in MONTHS.items() for alias in aliases}
+DAYS = {"aujourd'hui": 0, 'today': 0, 'hier': 1, 'yesterday': 1, 'avant-hier': 2}
+ONE = {'un', 'une', 'a', 'an', 'one'}
+TIME = r'(?:\s*,?\s*(?:à|a|at)?\s*(?P<hour>\d{1,2})\s*[:h]\s*(?P<minute>\d{2})?)?'
+PATTERNS = {
+    'relative': re.compile(r'^(?:il y a|depuis)\s+(?P<count>\d+|une?)\s*(?P<unit>[a-z]+)\.?$'),
+    'relative_en': re.compile(r'^(?P<count>\d+|an?|one)\s*(?P<unit>[a-z]+)\.?\s+ago$'),
+    'day': re.compile(r"^(?P<day>aujourd'hui|today|hier|yesterday|avant-hier)" + TIME + '$'),
+    'absolute': re.compile(
+        r'^(?:[a-z]+\.?,?\s+)?(?P<day>\d{1,2})(?:er)?\s+(?P<month>[a-zéû]+)\.?\s+(?P<year>\d{4})' + TIME + '$'),
+    'absolute_en': re.compile(
+        r'^(?P<month>[a-z]+)\.?\s+(?P<day>\d{1,2})(?:st|nd|rd|th)?,?\s+(?P<year>\d{4})' + TIME + '$'),
+    'iso': re.compile(r'^\d{4}-\d{2}-\d{2}(?:[t ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?(?:z|[+-]\d{2}:?\d{2})?$'),
+}
+class DateParser:
+    """
+    Fast-path date parser with a dateparser fallback.
+    Attributes:
+        languages (list): The languages dateparser is pinned to.
+    Methods:
+        parse: Parses a date string.
+        recognize: Resolves a date string with the precompiled patterns only.
+        stats: Property returning the number of values resolved by each pattern, by 'fallback' and 'miss'.
+        hit_rate: Property returning the share of values resolved without dateparser.
+    """
+    def __init__(self, languages=('fr', 'en')) -> None:
+        """
+        Initializes a DateParser.
+        Args:
+            languages (tuple, optional): The languages of the dateparser fallback. Defaults to ('fr', 'en').
+        """
+        self.languages = list(languages)
+        self._fallback = None
+        self._lock = threading.Lock()
+        # Each thread counts in its own Counter, merged when the stats are read.
+        self._local = threading.local()
+        self._counters = []
+    def parse(self, value: str):
+        """
+        Parses a date string, with dateparser only when no pattern matches.
+        Args:
+            value (str): The date string.
+        Returns:
+            datetime: The parsed date, or None if it cannot be parsed.
+        """
+        date = self.recognize(value)
+        if date is not None:
+            return date
+        date = self.fallback.get_date_data(value).date_obj
+        self._count('fallback' if date is not None else 'miss')
+        return date
+    def recognize(self, value: str):
+        """
+        Resolves a date string with the precompiled patterns only.
+        Args:
+            value (str): The date string.
+        Returns:
+            datetime: The parsed date, or None if no pattern resolves it.
+        """
+        text = value.strip().lower().replace('’', "'")
+        for name, pattern in PATTERNS.items():
+            match = pattern.match(text)
+            if match:
+                date = getattr(self, f"_{name.split('_')[0]}")(match, text)
+                if date is not None:
+                    self._count(name)
+                    return date
+        return None
+    def _count(self, name: str) -> None:
+        counter = getattr(self._local, 'counter', None)
+        if counter is None:
+            counter = self._local.counter = Counter()
+            with self._lock:
+                self._counters.append(counter)
+        counter[name] += 1
+    @property
+    def stats(self) -> Counter:
+        """
+        Property returning the number of values resolved by each pattern, by 'fallback' and 'miss',
+        summed over the threads that parsed dates.
+        Returns:
+            Counter: The merged counts.
+        """
+        with self._lock:
+            counters = list(self._counters)
+        stats = Counter()
+        for counter in counters:
+            stats.update(dict(counter))
+        return stats
+    @property
+    def hit_rate(self) -> float:
+        """
+        Property returning the share of parsed values resolved without dateparser.
+        Returns:
+            float: The hit rate of the precompiled patterns.
+        """
+        stats = self.stats
+        total = sum(stats.values())
+        return (total - stats['fallback'] - stats['miss']) / total if total else 0.0
+    @property
+    def fallback(self):
+        """
+        Property returning the dateparser parser, created once and pinned to the languages.
+        Returns:
+            DateDataParser: The dateparser parser.
+        """
+        if self._fallback is None:
+            with self._lock:
+                if self._fallback is None:
+                    from dateparser.date import DateDataParser
+                    self._fallback = DateDataParser(languages=self.languages)
+        return self._fallback
+    @staticmethod
+    def _relative(match, _text):
+        unit = UNITS.get(match['unit'])
+        if unit is None:
+            return None
+        count = 1 if match['count'] in ONE else int(match['count'])
+        return datetime.now() - timedelta(**{unit: count})
+    @staticmethod
+    def _day(match, _text):
+        date = datetime.now() - timedelta(days=DAYS[match['day']])
+        if match['hour'] is None:
+            return date
+        return date.replace(hour=int(match['hour']), minute=int(match['minute'] or 0), second=0, microsecond=0)
+    @staticmethod
+    def _absolute(match, _text):
+        month = MONTHS.get(match['month'])
+        if month is None:
+            return None
+        try:
+            return datetime(int(match['year']), month, int(match['day']),
+                            int(match['hour'] or 0), int(match['minute'] or 0))
+        except ValueError:
+            return None
+    @staticmethod
+    def _iso(_match, text):
+        text = text.upper().replace('Z', '+00:00')
+        if len(text) > 10 and text[-5] in '+-' and text[-3] != ':':
+            text = f'{text[:-2]}:{text[-2:]}'
+        try:
+            return datetime.fromisoformat(text)
+        except ValueError:
+            return None
+date_parser = DateParser()
@@ -8,12 +8,15 @@ Classes:
     Contact: A class representing contact information.
     PublishLink: A class representing the publish link of an item.
     ProductPrice: A class representing the price of a product.
+    ProductAmount: A class representing the price of a product as an integer amount.
+    ProductCurrency: A class representing the currency code of a product price.
 """
-import dateparser
-from .Model import Field,ParseError
+from .Model import Field,Formatter,ParseError
 from .Item import MainItem
 from .Css import MainCss
-from .utils import PHONE, CURRENCY, ravel, re
+from .Dates import date_parser
+from .Phones import numbers, numbers_many
+from .utils import CURRENCY, findall_many, ravel, ravel_many, re
 class CssField(Field, MainCss):
     """
     A class representing a CSS field.
@@ -21,6 +24,7 @@ class CssField(Field, MainCss):
         css (list): A list of CSS attributes.
     Methods:
         fmethod: Method defining the behavior for formatting CSS values.
+        format_many: Formats a column of CSS values.
     """
     css = [
         'xpaths',
@@ -34,6 +38,21 @@ class CssField(Field, MainCss):
             str: The formatted CSS value.
         """
         return ravel(value)
+    def format_many(self, values) -> list:
+        """
+        Formats a column of CSS values, flattened in one pass when fmethod is not overridden.
+        Args:
+            values: The CSS values to format.
+        Returns:
+            list: The formatted CSS values.
+        """
+        if self._batchable(CssField):
+            return ravel_many(values)
+        return super().format_many(values)
+    def _batchable(self, owner) -> bool:
+        # The vectorized format_many of owner only gives the values of format when neither fmethod
+        # nor format are overridden below owner and no cache is set.
+        return self.cache is None and type(self).fmethod is owner.fmethod and type(self).format is Formatter.format
 @MainItem.register
 class ProductTitle(CssField):
     """
@@ -54,20 +73,23 @@ class VendorLocation(CssField):
 class PublishDate(CssField):
     """
     A class representing the publish date of an item.
+    Relative dates are cached per minute, as their value depends on the time they are parsed at.
     Inherits:
         CssField
     Methods:
         fmethod: Method defining the behavior for formatting publish dates.
     """
+    cache_bucket = 60
     def fmethod(self, value: str) -> str:
         """
         Formats the given publish date value.
+        Common listing formats are resolved by the fast-path date parser, the others by dateparser.
         Args:
             value (str): The publish date value to format.
         Returns:
             str: The formatted publish date value.
         """
-        date = dateparser.parse(ravel(value))
+        date = date_parser.parse(ravel(value))
         if date:
             return date.isoformat()
         else :
@@ -80,16 +102,28 @@ class Contact(CssField):
         CssField
     Methods:
         fmethod: Method defining the behavior for formatting contact information.
+        format_many: Formats a column of contact information.
     """
     def fmethod(self, value: str) -> str:
         """
-        Formats the given contact information.
+        Formats the given contact information into its national phone numbers, joined by ';'.
         Args:
             value (str): The contact information to format.
         Returns:
             str: The formatted contact information.
         """
-        return re.sub(r'[\s\-\+]','',';'.join(set(re.findall(PHONE,ravel(value)))))
+        return ';'.join(numbers(value))
+    def format_many(self, values) -> list:
+        """
+        Formats a column of contact information, scanned at once.
+        Args:
+            values: The contact information to format.
+        Returns:
+            list: The formatted contact information.
+        """
+        if not self._batchable(Contact):
+            return super().format_many(values)
+        return [';'.join(found) for found in numbers_many(values)]
 @MainItem.register
 class PublishLink(CssField):
     """
@@ -98,6 +132,7 @@ class PublishLink(CssField):
         CssField
     Methods:
         fmethod: Method defining the behavior for formatting publish links.
+        format_many: Formats a column of publish links.
     """
     def fmethod(self, value: str) -> str:
         """
@@ -108,6 +143,17 @@ class PublishLink(CssField):
             str: The formatted publish link value.
         """
         return ravel(value,sep=';')
+    def format_many(self, values) -> list:
+        """
+        Formats a column of publish links, flattened in one pass.
+        Args:
+            values: The publish links to format.
+        Returns:
+            list: The formatted publish links.
+        """
+        if not self._batchable(PublishLink):
+            return super().format_many(values)
+        return ravel_many(values, sep=';')
 @MainItem.register
 class ProductPrice(CssField):
     """
@@ -116,6 +162,7 @@ class ProductPrice(CssField):
         CssField
     Methods:
         fmethod: Method defining the behavior for formatting product prices.
+        format_many: Formats a column of product prices.
     """
     def fmethod(self, value: str) -> str:
         """
@@ -126,3 +173,67 @@ class ProductPrice(CssField):
             str: The formatted product price value.
         """
         return re.sub(r'[\s,\.]','',';'.join(re.findall(CURRENCY,ravel(value,sep=';'))))
+    def format_many(self, values) -> list:
+        """
+        Formats a column of product prices, flattened in one pass and scanned with a single regex
+        run over the whole column.
+        Args:
+            values: The product prices to format.
+        Returns:
+            list: The formatted product prices.
+        """
+        if not self._batchable(ProductPrice):
+            return super().format_many(values)
+        return [re.sub(r'[\s,\.]','',';'.join(found)) for found in findall_many(CURRENCY, ravel_many(values, sep=';'))]
+CURRENCIES = [
+    ('EUR', re.compile(r'€|\beur(?:o|os)?\b', re.I)),
+    ('USD', re.compile(r'\$|\busd\b', re.I)),
+    ('XOF', re.compile(r'\b(?:f\s*cfa|cfa|fca|xof|f)\b', re.I)),
+]
+@MainItem.register
+class ProductAmount(ProductPrice):
+    """
+    A class representing the price of a product as an integer amount, the first price of the
+    card. It reads the ProductPrice configuration and is only parsed when selected by name.
+    Inherits:
+        ProductPrice
+    Methods:
+        fmethod: Method defining the behavior for formatting product amounts.
+    """
+    conf_section = 'ProductPrice'
+    default = False
+    def fmethod(self, value: str) -> int:
+        """
+        Formats the given product price value into an integer amount.
+        Args:
+            value (str): The product price value to format.
+        Returns:
+            int: The amount of the first price, or None if there is no price.
+        """
+        prices = super().fmethod(value).split(';')
+        return int(prices[0]) if prices[0].isdigit() else None
+@MainItem.register
+class ProductCurrency(ProductPrice):
+    """
+    A class representing the currency code of a product price. It reads the ProductPrice
+    configuration and is only parsed when selected by name.
+    Inherits:
+        ProductPrice
+    Methods:
+        fmethod: Method defining the behavior for formatting product currencies.
+    """
+    conf_section = 'ProductPrice'
+    default = False
+    def fmethod(self, value: str) -> str:
+        """
+        Formats the given product price value into an ISO 4217 currency code.
+        Args:
+            value (str): The product price value to format.
+        Returns:
+            str: 'XOF' for CFA francs, 'EUR' or 'USD', or '' if the currency is not recognized.
+        """
+        value = ravel(value, sep=';')
+        for code, pattern in CURRENCIES:
+            if pattern.search(value):
+                return code
+        return ''
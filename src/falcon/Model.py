@@ -7,16 +7,27 @@ Classes:
     Config: A class for reading and accessing configuration settings.
     Page: Abstract base class representing a web page.
     Site: A class representing a website for web scraping.
+The records (MappedData, LazyData), the caches (FormatCache, XPathCache) and the extractor code
+generation live in the Records, Cache, XPaths and Compiler modules, and are imported here.
 """
 from __future__ import annotations
-from collections import OrderedDict
+from collections import Counter, OrderedDict
 from abc import ABC, abstractmethod
-from functools import wraps, cached_property
-from dataclasses import asdict, make_dataclass
+from functools import cached_property, wraps
 from datetime import datetime
+from os import path
+from time import time
+from types import MappingProxyType
+import ast
 import configparser
 import logging
-from scrapy import Spider
+import threading
+from .Cache import FormatCache
+from .Compiler import build_extractor
+from .Pagination import Paginator
+from .Records import LazyData, MappedData
+from .XPaths import XPathCache
+from .utils import get_root, getall, owners
 logger = logging.getLogger()
 class ParseError(BaseException):
     """
@@ -37,11 +48,19 @@ class ParseError(BaseException):
 class Formatter(ABC):
     """
     Abstract base class representing a data formatter.
+    Attributes:
+        cache (FormatCache): The cache of formatted values, None to format every value. Defaults to None.
+        cache_bucket (float): For time-relative values, the number of seconds after which a raw value is
+            cached anew. Defaults to None.
     Methods:
         cast: Static method to cast values with error handling.
         fmethod: Abstract method defining the formatting behavior.
+        cache_key: Returns the cache key of a raw value.
         Format: Formats the given value using the specified formatting method.
+        format_many: Formats a column of values.
     """
+    cache: FormatCache = None
+    cache_bucket: float = None
     @staticmethod
     def cast(func) -> callable:
         """
@@ -77,16 +96,43 @@ class Formatter(ABC):
         Returns:
             Any: The formatted value.
         """
+    def cache_key(self, value) -> tuple:
+        """
+        Returns the cache key of a raw value: the formatter class, the value and, when cache_bucket
+        is set, the current time bucket.
+        Args:
+            value: The raw value.
+        Returns:
+            tuple: The cache key.
+        """
+        if isinstance(value, (list, set)):
+            value = tuple(value)
+        bucket = None if self.cache_bucket is None else int(time() // self.cache_bucket)
+        return (self.__class__, value, bucket)
     @cast
+    def _format(self, value):
+        return self.fmethod(value)
     def format(self, value):
         """
-        Formats the given value using the specified formatting method.
+        Formats the given value using the specified formatting method, through the cache if any.
         Args:
             value: The value to format.
         Returns:
             Any: The formatted value.
         """
-        return self.fmethod(value)
+        if self.cache is None:
+            return self._format(value)
+        return self.cache.get(self.cache_key(value), self._format, value)
+    def format_many(self, values) -> list:
+        """
+        Formats a column of values, as format does for each value: a value that fails to parse
+        is formatted to ''. Formatters may override it with a vectorized implementation.
+        Args:
+            values: The values to format.
+        Returns:
+            list: The formatted values, in order.
+        """
+        return [self.format(value) for value in values]
 class Field(Formatter):
     """
     A class representing a field extracted from HTML content.
@@ -94,8 +140,17 @@ class Field(Formatter):
         xpaths (list): A list of XPath expressions to extract values.
         relative_xpaths (list): A list of XPath expressions relative to the current element.
         regex_list (list): A list of regular expressions to match values.
+        first_match (bool): Whether to try the paths one at a time, in configuration order, and stop
+            at the first non-empty result instead of evaluating their union. Defaults to False.
+        default (bool): Whether the field is parsed when no fields are selected. Defaults to True.
+        skipped (int): The number of alternatives skipped by the last first_match extraction.
+        profile: The selector profile of the site the HTML comes from, if any.
+        skipped_stats (Counter): The counter the alternatives skipped by first_match are added to,
+            per Field class name, if any.
+        method_paths (dict): The paths attribute read by each value property.
     Methods:
         __init__: Initializes a Field object with the provided HTML content.
+        extract: Extracts the raw values matched by the specified paths.
         getter: Retrieves values from HTML content based on specified paths.
         value: Property returning values extracted using xpaths.
         relative_value: Property returning values extracted using relative_xpaths.
@@ -103,13 +158,41 @@ class Field(Formatter):
     xpaths: list[str]
     relative_xpaths: list[str]
     regex_list: list[str]
-    def __init__(self, html):
+    first_match: bool = False
+    default: bool = True
+    method_paths: dict = {'value': 'xpaths', 'relative_value': 'relative_xpaths'}
+    def __init__(self, html, profile=None, skipped_stats: Counter = None):
         """
         Initializes a Field object with the provided HTML content.
         Args:
             html: The HTML content from which to extract values.
+            profile (SiteProfile, optional): The selector profile of the site. Defaults to None.
+            skipped_stats (Counter, optional): The counter of the page or spider the skipped alternatives
+                are added to. Defaults to None.
         """
         self.html = html
+        self.profile = profile
+        self.skipped_stats = skipped_stats
+        self.skipped = 0
+    def extract(self, paths='xpaths') -> list:
+        """
+        Extracts the raw values matched by the specified paths.
+        Args:
+            paths (str): The type of paths to use for extraction. Defaults to 'xpaths'.
+        Returns:
+            list: A list of extracted strings.
+        """
+        root = get_root(self.html)
+        if self.profile is not None:
+            # The profile sets skipped on first_match fields.
+            out = self.profile.extract(self, paths, root, first_match=self.first_match)
+        elif not self.first_match:
+            return getall(XPathCache.get(self, paths)(root))
+        else:
+            out, self.skipped = XPathCache.first(XPathCache.alternatives(self, paths), root)
+        if self.first_match and self.skipped_stats is not None:
+            self.skipped_stats[str(self)] += self.skipped
+        return getall(out)
     def getter(self, paths='xpaths')->list:
         """
         Retrieves values from HTML content based on specified paths.
@@ -118,8 +201,7 @@ class Field(Formatter):
         Returns:
             list: A list of extracted values.
         """
-        out = self.html.xpath('|'.join(getattr(self,paths))).getall()
-        return self.format(out)
+        return self.format(self.extract(paths))
     @cached_property
     def value(self):
         """
@@ -139,9 +221,12 @@ class Field(Formatter):
 class Cursor(ABC):
     """
     Abstract base class representing a connection interface.
+    Attributes:
+        required_fields (tuple): The names of the fields push reads, which a site cannot leave out.
     Methods:
         push: Abstract method to push an object to the connection.
     """
+    required_fields: tuple = ()
     def __bool__(self):
         return True
     @abstractmethod
@@ -153,42 +238,6 @@ class Cursor(ABC):
         Raises:
             NotImplementedError: If the method is not implemented in the subclass.
         """
-class MappedData:
-    """
-    Represents mapped data with a specific name and fields.
-    Attributes:
-        name (str): The name of the mapped data.
-        fields (list): A list of field names for the dataclass.
-        dataclass: The constructed dataclass object representing the mapped data.
-    Methods:
-        __init__: Initializes a MappedData object with the provided name and fields.
-        __str__: Returns the dataclass as a dictionary.
-        __rshift__: Pushes the string representation of the dataclass to a consumer.
-    """
-    def __init__(self, name, fields):
-        """
-        Initializes a MappedData object with the provided name and fields.
-        Args:
-            name (str): The name of the mapped data.
-            fields (list): A list of field names for the dataclass.
-        """
-        self.name = name
-        self.fields = fields
-        self.dataclass = make_dataclass(self.name, self.fields)()
-    def to_dict(self):
-        """
-        Returns the dataclass as a dictionary.
-        Returns:
-            dict: The dataclass represented as a dictionary.
-        """
-        return asdict(self.dataclass,dict_factory=OrderedDict)
-    def __rshift__(self, cursor):
-        """
-        Pushes the string representation of the dataclass to a consumer.
-        Args:
-            cursor: The consumer object to which the data is pushed.
-        """
-        cursor.push(self)
 class Item:
     """
     A class representing an item extracted from a web page.
@@ -197,19 +246,25 @@ class Item:
         __str__: Returns the name of the Item class as a string.
         __rshift__: Defines the behavior for the '>>' operator.
         parse: Parses HTML content and constructs an Item object.
+        parse_batch: Parses every card of a page into columns.
+        project: Returns the registered fieldclasses selected by name.
+        compile: Generates a specialized extraction function for a site profile.
     """
+    compile_dir: str = path.join(path.expanduser('~'), '.cache', 'falcon', 'compiled')
+    _extractors: dict = {}
     @classmethod
-    def register(cls, fieldclass) -> None:
+    def register(cls, fieldclass):
         """
         Registers a fieldclass to the Item class.
         Args:
             fieldclass: The class representing a field in the Item.
         Returns:
-            None
+            The fieldclass, so registered fields can be subclassed.
         """
         if not hasattr(cls, 'registry'):
             cls.registry: list = []
         cls.registry += [fieldclass]
+        return fieldclass
     def __str__(self):
         """
         Returns the name of the Item class as a string.
@@ -218,46 +273,184 @@ class Item:
         """
         return self.__class__.__name__
     @classmethod
-    def parse(cls, html, method='value'):
+    def compile(cls, site_profile=None, paths='relative_xpaths', fields=None, skipped_stats=None):
+        """
+        Generates a specialized extraction function for a site profile.
+        The function takes a card element and returns a tuple of the formatted field values followed
+        by the creation date. Compiled XPaths and formatting methods are bound as globals of the
+        function, first_match fields evaluate their alternatives up to the first match (see
+        XPathCache.first), and formatting errors are handled inline, so no object is created per card.
+        The profile's kept alternatives are used as they are: the compiled function does not fall
+        back to the full list (see Compiler.build_extractor).
+        The code object is cached in memory and marshalled to compile_dir, keyed by the hash of the
+        configuration files, the profile and the fields, so warm starts skip code generation.
+        Args:
+            site_profile (SiteProfile, optional): The profile whose kept alternatives are used. Defaults to None.
+            paths (str, optional): The paths relative to a card. Defaults to 'relative_xpaths'.
+            fields (list, optional): The names of the fields to extract. Defaults to every default field.
+            skipped_stats (Counter, optional): The counter the alternatives skipped by first_match fields
+                are added to, per Field class name. Defaults to None.
+        Returns:
+            callable: The extraction function, with the names of its values in its 'fields' attribute.
+        """
+        registry = cls.project(fields)
+        kept = site_profile.kept if site_profile is not None else {}
+        namespace = {
+            '_getall': getall, '_ParseError': ParseError, '_warning': logger.warning, '_now': datetime.now,
+            '_skipped': skipped_stats}
+        return build_extractor(cls.__name__, registry, kept, paths, namespace, cls.compile_dir, cls._extractors)
+    @classmethod
+    def project(cls, fields=None) -> list:
+        """
+        Returns the registered fieldclasses selected by name, in registration order.
+        Args:
+            fields (list, optional): The names of the fields to keep. Defaults to every registered
+                field whose default attribute is set.
+        Returns:
+            list: The selected fieldclasses.
+        Raises:
+            ValueError: If a name does not match a registered field.
+        """
+        if fields is None:
+            return [field for field in cls.registry if field.default]
+        unknown = set(fields) - {field.__name__ for field in cls.registry}
+        if unknown:
+            raise ValueError(f'unknown fields for {cls.__name__}: {sorted(unknown)}')
+        return [field for field in cls.registry if field.__name__ in fields]
+    @classmethod
+    def parse(cls, html, method='value', profile=None, fields=None, lazy=False, skipped_stats=None,
+              single_pass=False):
         """
         Parses HTML content and constructs an Item object.
         Args:
             html: HTML content to parse.
             method (str, optional): The parsing method. Defaults to 'value'.
+            profile (SiteProfile, optional): The selector profile of the site. Defaults to None.
+            fields (list, optional): The names of the fields to parse, the others are neither
+                extracted nor formatted. Defaults to every default field.
+            lazy (bool, optional): Whether to return a LazyData record whose fields are evaluated on
+                first access. Defaults to False.
+            skipped_stats (Counter, optional): The counter the alternatives skipped by first_match fields
+                are added to, per Field class name. Defaults to None.
+            single_pass (bool, optional): Whether to extract every field with one tagged XPath evaluation
+                instead of one evaluation per field (see XPathCache.split). Defaults to False.
         Returns:
             dataclass: The constructed dataclass object representing the parsed item.
+        Raises:
+            ValueError: If single_pass is combined with a profile or lazy records, which evaluate fields one by one.
         """
         self = cls()
+        registry = self.project(fields)
+        if single_pass and (profile is not None or lazy):
+            raise ValueError('single_pass extraction evaluates every field at once, without a profile or lazy records')
+        if lazy:
+            return LazyData(str(self), [
+                (field.__name__, field.fmethod.__annotations__.get('return', str).__name__,
+                 field(html, profile, skipped_stats), method)
+                for field in registry
+            ], datetime.now().isoformat())
+        if single_pass:
+            values = []
+            matches = XPathCache.split(registry, Field.method_paths[method], get_root(html))
+            for field, (out, skipped) in zip(registry, matches):
+                if field.first_match and skipped_stats is not None:
+                    skipped_stats[field.__name__] += skipped
+                values.append(field(html).format(getall(out)))
+        else:
+            values = [getattr(field(html, profile, skipped_stats), method) for field in registry]
         item_fields = [
             (field.__name__,
              field.fmethod.__annotations__.get('return', str).__name__,
-             getattr(field(html), method))
-            for field in self.registry
+             value)
+            for field, value in zip(registry, values)
         ] + [('CreatedAt', datetime, datetime.now().isoformat())]
         return MappedData(str(self), item_fields)
+    @classmethod
+    def parse_batch(cls, cards, root, paths='relative_xpaths', fields=None, profile=None,
+                    skipped_stats=None) -> OrderedDict:
+        """
+        Parses every card of a page into columns.
+        The relative paths of a field are evaluated once against the page root and each match is
+        assigned to the cards containing it. Fields with a path that cannot be anchored at the page
+        root (see XPathCache.anchorable), first_match fields and the fields of a profiled site are
+        evaluated card by card, as in parse.
+        Args:
+            cards (list): The card elements of the page.
+            root: The root element of the page.
+            paths (str, optional): The paths relative to a card. Defaults to 'relative_xpaths'.
+            fields (list, optional): The names of the fields to parse. Defaults to every default field.
+            profile (SiteProfile, optional): The selector profile of the site. Defaults to None.
+            skipped_stats (Counter, optional): The counter the alternatives skipped by first_match fields
+                are added to, per Field class name. Defaults to None.
+        Returns:
+            OrderedDict: One list of values per field name, in card order.
+        """
+        self = cls()
+        cards = list(cards)
+        index = {card: ix for ix, card in enumerate(cards)}
+        columns = OrderedDict()
+        for field in self.project(fields):
+            formatter = field(None)
+            if profile is not None or field.first_match:
+                values = [field(card, profile, skipped_stats).extract(paths) for card in cards]
+            elif XPathCache.anchorable(formatter, paths):
+                matches = [[] for _ in cards]
+                for match in XPathCache.anchored(formatter, paths)(get_root(root)):
+                    for ix in owners(match, index):
+                        matches[ix].append(match)
+                values = [getall(match) for match in matches]
+            else:
+                compiled = XPathCache.get(formatter, paths)
+                values = [getall(compiled(card)) for card in cards]
+            columns[field.__name__] = formatter.format_many(values)
+        columns['CreatedAt'] = [datetime.now().isoformat()] * len(cards)
+        return columns
 class Config:
     """
     A class for reading and accessing configuration settings.
+    The configuration file is parsed once per process into an immutable plan: one read-only
+    table per section, with list-like values frozen into tuples.
     Attributes:
         _conf_file (str): The path to the configuration file.
         _val_conf_attr (list): A list of valid configuration attributes.
-        check_stage (int): The stage of attribute checking.
+        conf_section (str): The section the attributes are read from. Defaults to the class name.
+        _plans (dict): Frozen plans keyed by configuration file.
     Methods:
-        read_conf: Property to read the configuration file.
+        plan: Returns the frozen extraction plan of the configuration file.
     """
     _conf_file: str
     _val_conf_attr: list = []
-    check_stage: int = 0
-    @cached_property
-    def read_conf(self):
+    conf_section: str = None
+    _plans: dict = {}
+    _plans_lock = threading.Lock()
+    @classmethod
+    def plan(cls) -> MappingProxyType:
         """
-        Property to read the configuration file.
+        Returns the frozen extraction plan of the configuration file, parsing it on first use.
         Returns:
-            ConfigParser: The parsed configuration object.
-        """
+            MappingProxyType: Read-only tables of configuration values keyed by section name.
+        """
+        plan = cls._plans.get(cls._conf_file)
+        if plan is None:
+            with cls._plans_lock:
+                plan = cls._plans.get(cls._conf_file)
+                if plan is None:
+                    plan = cls._plans[cls._conf_file] = cls._freeze(cls._conf_file)
+        return plan
+    @staticmethod
+    def _freeze(conf_file: str) -> MappingProxyType:
         config = configparser.ConfigParser()
-        config.read(self._conf_file)
-        return config
+        config.read(conf_file)
+        plan = {}
+        for section in config.sections():
+            table = {}
+            for key, conf in config[section].items():
+                # List-like values are stored as python literals, freeze them into tuples.
+                if conf.startswith('['):
+                    conf = tuple(ast.literal_eval(conf))
+                table[key] = conf
+            plan[section] = MappingProxyType(table)
+        return MappingProxyType(plan)
     def __str__(self):
         """
         Returns the name of the Config class as a string.
@@ -268,31 +461,29 @@ class Config:
         return name
     def __getattr__(self, val):
         """
-        Retrieves the value of a configuration attribute.
+        Retrieves the value of a configuration attribute from the frozen plan.
         Args:
             val (str): The name of the configuration attribute.
         Returns:
-            str: The value of the configuration attribute.
-        """
-        if self.check_stage == 0:
-            self.check_stage = 1
-            if val in self._val_conf_attr:
-                self.check_stage = 0
-                conf = self.read_conf[str(self)][val]
-                # If the configuration value starts with '[' (indicating it's a list-like representation),
-                # evaluate it using eval to convert it into an actual list object.
-                if conf.startswith('['):
-                    conf = conf[2:-2].split("\', \'")
-                return conf
-            self.check_stage = 0
-        else:
-            return self.__getattribute__(val)
+            The value of the configuration attribute, or None if it is not configured.
+        """
+        if val.startswith('__'):
+            raise AttributeError(val)
+        table = self.plan().get(self.conf_section or str(self), {})
+        if val in table and val in self._val_conf_attr:
+            return table[val]
+        return None
 class Page(ABC):
     """
     Abstract base class representing a web page.
     Attributes:
         xpaths (list): A list of XPath expressions to extract items from the page.
         next_xpaths (list): A list of XPath expressions to locate the next page link.
+        profile (SiteProfile): The selector profile of the site, if any.
+        fields (list): The names of the fields to parse, None for every field.
+        lazy (bool): Whether items are LazyData records evaluated on first access.
+        skipped_stats (Counter): The alternatives skipped by the first_match fields of the items, per Field
+            class name. Pages share the counter they are given, clear it to reset the counts.
         _ix (int): Internal index for iteration.
     Methods:
         as_item: Abstract method to convert HTML content to an Item object.
@@ -302,6 +493,8 @@ class Page(ABC):
         __iter__: Returns an iterator object.
         __next__: Returns the next item in iteration.
         __getitem__: Retrieves the item at the specified index.
+        as_batch: Converts the items of the page to columns, card by card.
+        extract_batch: Returns the items of the page as columns.
     """
     xpaths: list[str]
     next_xpaths: list[str]
@@ -315,15 +508,30 @@ class Page(ABC):
         Returns:
             Item: The parsed item from the HTML content.
         """
-    def __init__(self, response):
+    def __init__(self, response, profile=None, fields=None, lazy=False, skipped_stats: Counter = None):
         """
         Initializes a Page object with the provided response.
         Args:
             response: The response object from the web request.
+            profile (SiteProfile, optional): The selector profile of the site. Defaults to None.
+            fields (list, optional): The names of the fields to parse. Defaults to every field.
+            lazy (bool, optional): Whether items are evaluated on first access. Defaults to False.
+            skipped_stats (Counter, optional): The counter of the skipped alternatives, e.g. one per spider.
+                Defaults to a new counter for the page.
         """
         self.response = response
-        self.page_items = self.response.xpath('|'.join(self.xpaths))
-        self.next = self.response.xpath('|'.join(self.next_xpaths)).get()
+        self.profile = profile
+        self.fields = fields
+        self.lazy = lazy
+        self.skipped_stats = Counter() if skipped_stats is None else skipped_stats
+        root = get_root(self.response)
+        if profile is None:
+            self.page_items = XPathCache.get(self, 'xpaths')(root)
+            self.next = next(iter(getall(XPathCache.get(self, 'next_xpaths')(root))), None)
+        else:
+            profile.new_page()
+            self.page_items = profile.extract(self, 'xpaths', root)
+            self.next = next(iter(getall(profile.extract(self, 'next_xpaths', root))), None)
     def __len__(self):
         """
         Returns the number of items on the page.
@@ -360,6 +568,27 @@ class Page(ABC):
             Item: The item at the specified index.
         """
         return self.as_item(self.page_items[ix])
+    def as_batch(self, cards):
+        """
+        Converts the items of the page to columns, card by card with as_item. Page classes may
+        override it with an evaluation per field for the whole page (see Item.parse_batch).
+        Args:
+            cards (list): The card elements of the page.
+        Returns:
+            OrderedDict: One list of values per field name, in card order.
+        """
+        columns = OrderedDict()
+        for card in cards:
+            for name, value in self.as_item(card).to_flat().items():
+                columns.setdefault(name, []).append(value)
+        return columns
+    def extract_batch(self):
+        """
+        Returns the items of the page as columns, with one XPath evaluation per field for the whole page.
+        Returns:
+            OrderedDict: One list of values per field name, in card order.
+        """
+        return self.as_batch(self.page_items)
 class Site:
     """
     A class representing a website.
@@ -368,6 +597,16 @@ class Site:
         start_urls (list): A list of starting URLs for the web crawler.
         Page (Page): The page parser class.
         db (str, optional): The database connection string. Defaults to None.
+        profile (SiteProfile, optional): The selector profile of the website. Defaults to None.
+        fields (list, optional): The names of the fields to parse. Defaults to every field.
+        pool (ParsePool, optional): The worker pool pages are parsed in, off the reactor thread.
+            Defaults to None, to parse pages in the spider.
+        max_in_flight (int, optional): The maximum number of pages sent to the pool at once.
+            Defaults to twice the number of workers.
+        window (int, optional): The number of numbered pages requested ahead of the last page parsed.
+            Defaults to 0, to follow the next page links one by one.
+        watermark (Watermark, optional): The watermark of the categories of the website, pagination
+            stops at the pages crawled by a previous run. Defaults to None.
     Methods:
         spider: A property returning a spider class for scraping.
     """
@@ -375,6 +614,12 @@ class Site:
     start_urls: list
     pageclass: Page
     follow: bool = True
+    profile = None
+    fields: list = None
+    pool = None
+    max_in_flight: int = None
+    window: int = 0
+    watermark = None
     class Db:
         """
         Default Db Class
@@ -392,6 +637,10 @@ class Site:
         Returns:
             class: A spider class for scraping data from the website.
         """
+        # scrapy is only loaded to crawl, so offline parsing and workers start without it.
+        from scrapy import Spider
+        from scrapy.utils.defer import maybe_deferred_to_future
+        from twisted.internet import defer
         class SiteSpider(Spider):
             """
             A spider class for scraping data from the website.
@@ -400,23 +649,103 @@ class Site:
                 start_urls (list): A list of starting URLs for scraping.
                 Page (Page): The page parser class.
                 engine (str): The engine used for parsing.
+                pool (ParsePool): The worker pool pages are parsed in, if any.
+                slots (DeferredSemaphore): The slots of the pages sent to the pool.
+                skipped_stats (Counter): The alternatives skipped by first_match fields in the pages of the spider.
+                paginator (Paginator): The pagination state of the spider.
+                watermark (Watermark): The watermark pagination stops at, if any.
             """
             name = self.name
             start_urls = self.start_urls
             pageclass = self.pageclass
             db = self.Db
             follow = self.follow
+            profile = self.profile
+            fields = self.fields
+            pool = self.pool
+            max_in_flight = self.max_in_flight or 2 * getattr(self.pool, 'workers', 1)
+            window = self.window
+            watermark = self.watermark
+            @cached_property
+            def slots(self):
+                """
+                The slots of the pages sent to the pool.
+                """
+                return defer.DeferredSemaphore(self.max_in_flight)
+            @cached_property
+            def skipped_stats(self):
+                """
+                The alternatives skipped by first_match fields in the pages of the spider, per Field class name.
+                """
+                return Counter()
+            @cached_property
+            def paginator(self):
+                """
+                The pagination state of the spider.
+                """
+                return Paginator(self.window)
             def parse(self, response):
                 """
-                Parses the response from the website.
+                Parses the response from the website, in the worker pool if the site has one.
                 Args:
                     response: The response from the website.
                 Yields:
-                    dict: The scraped data items.
+                    dict: The scraped data items, as copies of the flat mapping of the records, so item
+                        pipelines can change them.
+                """
+                if self.pool is not None:
+                    return self.parse_offloaded(response)
+                return self.parse_inline(response)
+            def parse_inline(self, response):
+                """
+                Parses the response in the spider.
                 """
-                for item in (page := self.pageclass(response)):
+                records = []
+                page = self.pageclass(response, profile=self.profile, fields=self.fields,
+                                      skipped_stats=self.skipped_stats)
+                for item in page:
                     item >> self.db
-                    yield item.to_dict()
-                if page.next and self.follow:
-                    response.follow(page.next, callback=self.parse)
+                    records.append(item)
+                    yield dict(item.to_flat())
+                yield from self.paginate(response, page.next and response.urljoin(page.next), records)
+            async def parse_offloaded(self, response):
+                """
+                Parses the response in the worker pool, once one of the slots is free.
+                """
+                records, next_url = await maybe_deferred_to_future(self.slots.run(self.offload, response))
+                for item in records:
+                    item >> self.db
+                    yield dict(item.to_flat())
+                for request in self.paginate(response, next_url, records):
+                    yield request
+            def paginate(self, response, next_url, records):
+                """
+                Records the page in the watermark, whether or not the spider follows the next pages, and yields
+                the requests of the pages following the response, predicted by the paginator.
+                """
+                crawled = self.watermark is not None and self.watermark.update(response.url, records)
+                if self.follow:
+                    signature = Paginator.signature(records)
+                    if crawled:
+                        # Every listing of the page was crawled by a previous run, as are the pages after it.
+                        signature, next_url = frozenset(), None
+                    for url in self.paginator.follow(response.url, next_url, signature):
+                        yield response.follow(url, callback=self.parse)
+            def closed(self, reason):
+                """
+                Persists the watermark of the site when the spider closes.
+                """
+                if self.watermark is not None:
+                    self.watermark.save()
+            def offload(self, response):
+                """
+                Sends the response body to the pool and returns a Deferred fired on the reactor thread.
+                """
+                from twisted.internet import reactor
+                deferred = defer.Deferred()
+                self.pool.parse_async(
+                    response.body, response.url, encoding=getattr(response, 'encoding', 'utf-8'), fields=self.fields,
+                    callback=lambda result: reactor.callFromThread(deferred.callback, result),
+                    error_callback=lambda error: reactor.callFromThread(deferred.errback, error))
+                return deferred
         return SiteSpider
@@ -14,6 +14,7 @@ class MainPage(Page, MainCss):
         css (list): A list of CSS attributes.
     Methods:
         as_item: Converts HTML content to a MainItem object.
+        as_batch: Converts the cards of the page to MainItem columns.
     """
     css = [
         'xpaths',
@@ -26,4 +27,15 @@ class MainPage(Page, MainCss):
         Returns:
             MainItem: The parsed MainItem object.
         """
-        return MainItem.parse(html, method='relative_value')
+        return MainItem.parse(html, method='relative_value', profile=self.profile, fields=self.fields,
+                              lazy=self.lazy, skipped_stats=self.skipped_stats)
+    def as_batch(self, cards):
+        """
+        Converts the cards of the page to MainItem columns.
+        Args:
+            cards (list): The card elements of the page.
+        Returns:
+            OrderedDict: One list of values per MainItem field name.
+        """
+        return MainItem.parse_batch(cards, self.response, paths='relative_xpaths', fields=self.fields,
+                                    profile=self.profile, skipped_stats=self.skipped_stats)
@@ -0,0 +1,143 @@
+"""
+Module for predicting the pages of a listing.
+Listing sites number their pages in the URL, e.g. '?page=3', '?p=3' or '/page/3'. When the next
+link of a page follows such a pattern, the following pages are requested a window at a time
+instead of one round trip per page, until a page comes back empty or repeats a page already
+seen. Pages without a numbered next link are followed link by link.
+Classes:
+    PagePattern: Numbered page pattern of a URL.
+    Paginator: Pagination state of a spider.
+Example:
+    >>> paginator = Paginator(window=4)
+    >>> paginator.follow('https://site.sn/voitures', 'https://site.sn/voitures?page=2', signature)
+    ['https://site.sn/voitures?page=2', 'https://site.sn/voitures?page=3', ...]
+"""
+from urllib.parse import urlsplit, urlunsplit
+import re
+import threading
+PAGE_QUERY = re.compile(r'(?:^|&)(?:page|p|pg|paged|pagina|pn)=(?P<number>\d+)(?=&|$)', re.I)
+PAGE_PATH = re.compile(r'/(?:page|p|pagina)/(?P<number>\d+)(?=/|$)', re.I)
+def _number(text: str, match) -> str:
+    # Marks the page number, which no URL component holds unescaped.
+    return f"{text[:match.start('number')]}\x00{text[match.end('number'):]}"
+class PagePattern:
+    """
+    Numbered page pattern of a URL.
+    Attributes:
+        template (str): The URL with '{}' in place of the page number.
+        number (int): The page number of the URL.
+    Methods:
+        detect: Returns the numbered page pattern of a URL.
+        url: Returns the URL of a page number.
+    """
+    def __init__(self, template: str, number: int) -> None:
+        """
+        Initializes a PagePattern.
+        Args:
+            template (str): The URL with '{}' in place of the page number.
+            number (int): The page number of the URL.
+        """
+        self.template = template
+        self.number = number
+    @classmethod
+    def detect(cls, url: str):
+        """
+        Returns the numbered page pattern of a URL, from a page query parameter or a /page/N path.
+        Args:
+            url (str): The URL.
+        Returns:
+            PagePattern: The pattern, or None if the URL has no page number.
+        """
+        parts = urlsplit(url)
+        match = PAGE_QUERY.search(parts.query)
+        if match:
+            parts = parts._replace(query=_number(parts.query, match))
+        else:
+            match = PAGE_PATH.search(parts.path)
+            if match is None:
+                return None
+            parts = parts._replace(path=_number(parts.path, match))
+        template = urlunsplit(parts).replace('{', '{{').replace('}', '}}').replace('\x00', '{}')
+        return cls(template, int(match['number']))
+    def url(self, number: int) -> str:
+        """
+        Returns the URL of a page number.
+        Args:
+            number (int): The page number.
+        Returns:
+            str: The URL.
+        """
+        return self.template.format(number)
+class Paginator:
+    """
+    Pagination state of a spider: the numbered series of pages requested so far.
+    A series is opened by the first numbered next link of a page. Each page of the series that
+    holds new records extends the requests to the window pages that follow it; an empty page or
+    a page whose records were already seen closes the series. Pages whose records have no signature
+    are not known to be repeated and extend the series.
+    Attributes:
+        window (int): The number of pages requested ahead of the last page parsed.
+        series (dict): The series by template, as [last page requested, closed, signatures seen].
+    Methods:
+        signature: Returns the signature of the records of a page.
+        follow: Returns the URLs to request after a page.
+    """
+    def __init__(self, window: int = 4) -> None:
+        """
+        Initializes a Paginator.
+        Args:
+            window (int, optional): The number of pages requested ahead, 0 to only follow next links.
+                Defaults to 4.
+        """
+        self.window = window
+        self.series = {}
+        self._lock = threading.Lock()
+    @staticmethod
+    def signature(records: list) -> frozenset:
+        """
+        Returns the signature of the records of a page: their non-empty links, or their values if they have none.
+        Args:
+            records (list): The records of the page.
+        Returns:
+            frozenset: The signature, empty for a page without records, or None when no record has a
+                link or a value to tell the page apart from another.
+        """
+        if not records:
+            return frozenset()
+        flats = [record.to_flat() for record in records]
+        signature = frozenset(flat['PublishLink'] for flat in flats if flat.get('PublishLink'))
+        if not signature:
+            values = (tuple(value for key, value in flat.items() if key != 'CreatedAt') for flat in flats)
+            signature = frozenset(value for value in values if any(value))
+        return signature or None
+    def follow(self, url: str, next_url: str, signature: frozenset) -> list[str]:
+        """
+        Returns the URLs to request after a page.
+        Args:
+            url (str): The URL of the page.
+            next_url (str): The absolute URL of the next page link, None if there is none.
+            signature (frozenset): The signature of the records of the page, None if it is unknown.
+        Returns:
+            list: The URLs to request, the next link alone when it is not numbered.
+        """
+        current = PagePattern.detect(url)
+        with self._lock:
+            series = self.series.get(current.template) if current is not None else None
+            if series is None:
+                opened = next_url and self.window and signature != frozenset()
+                pattern = PagePattern.detect(next_url) if opened else None
+                if pattern is None:
+                    return [next_url] if next_url else []
+                if pattern.template in self.series:
+                    return []
+                series = self.series[pattern.template] = [pattern.number - 1, False, {signature} - {None}]
+                number, current = pattern.number - 1, pattern
+            else:
+                number = current.number
+                if series[1] or signature == frozenset() or signature in series[2]:
+                    series[1] = True
+                    return []
+                if signature is not None:
+                    series[2].add(signature)
+            first, series[0] = series[0] + 1, max(series[0], number + self.window)
+            return [current.url(page) for page in range(first, series[0] + 1)]
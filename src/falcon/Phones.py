@@ -0,0 +1,114 @@
+"""
+Module for scanning Senegalese phone numbers.
+Numbers are read from runs of digit groups separated by up to three spaces, dashes, dots,
+parentheses or plus signs, so a text is scanned in linear time. A run yields the national numbers
+it holds: 9 digits starting with 3 (landlines) or 7 (mobiles), optionally prefixed by 221 or 00221.
+Functions:
+    numbers: Returns the national numbers found in a text, in order and without duplicates.
+    numbers_many: Returns the national numbers found in each value of a column.
+    encode: Returns the compact integer encoding of a national number.
+    decode: Returns the national number of an integer encoding.
+Example:
+    >>> numbers(['tel:+221 77 123 45 67', 'whatsapp:00221771234567', 'sms:78-123-45-67'])
+    ['771234567', '781234567']
+    >>> encode('771234567')
+    221771234567
+"""
+from itertools import accumulate
+from typing import Union
+import re
+from .utils import findall_many
+COUNTRY = '221'
+PREFIXES = ('00' + COUNTRY, COUNTRY)
+LENGTHS = (9, 9 + len(COUNTRY), 9 + len(PREFIXES[0]))
+LEADING = frozenset('37' + COUNTRY[0] + PREFIXES[0][0])
+# Digit groups joined by separators only, so each character is consumed once and runs never cross lines.
+RUN = re.compile(r'\d+(?:(?:[^\S\n]|[-.()+]){1,3}\d+)*')
+DIGITS = re.compile(r'\d+')
+def national(digits: str) -> str:
+    """
+    Returns the national number written by a string of digits.
+    Args:
+        digits (str): The digits, with or without the country prefix.
+    Returns:
+        str: The 9-digit national number, or None if the digits are not a Senegalese number.
+    """
+    for prefix in PREFIXES:
+        if len(digits) == len(prefix) + 9 and digits.startswith(prefix):
+            digits = digits[len(prefix):]
+            break
+    if len(digits) == 9 and digits[0] in '37':
+        return digits
+    return None
+def _run_numbers(run: str):
+    if len(run) < 9:
+        return
+    if run.isdigit():
+        number = national(run)
+        if number:
+            yield number
+        return
+    groups = DIGITS.findall(run)
+    digits = ''.join(groups)
+    # Offsets of the group boundaries in the digits: a number spans whole groups.
+    offsets = list(accumulate(map(len, groups), initial=0))
+    bounds = {offset: ix for ix, offset in enumerate(offsets)}
+    ix = 0
+    while ix < len(groups):
+        start = offsets[ix]
+        if digits[start] in LEADING:
+            for length in LENGTHS:
+                if start + length in bounds:
+                    number = national(digits[start:start + length])
+                    if number:
+                        yield number
+                        ix = bounds[start + length]
+                        break
+            else:
+                ix += 1
+        else:
+            ix += 1
+def _text(value: Union[str, list[str]]) -> str:
+    # Texts are joined by ';', which ends a run like a line break does.
+    if not isinstance(value, str):
+        value = ';'.join(value)
+    return value.replace('%20', ' ').replace('\n', ' ')
+def numbers(value: Union[str, list[str]]) -> list[str]:
+    """
+    Returns the national numbers found in a text, in order and without duplicates.
+    Args:
+        value (Union[str, list[str]]): The text, or the texts, to scan.
+    Returns:
+        list: The 9-digit national numbers.
+    """
+    return list(dict.fromkeys(number for run in RUN.findall(_text(value)) for number in _run_numbers(run)))
+def numbers_many(values) -> list[list[str]]:
+    """
+    Returns the national numbers found in each value of a column, scanning the column at once.
+    Args:
+        values: The texts, or lists of texts, to scan.
+    Returns:
+        list: The national numbers of each value, as returned by numbers.
+    """
+    runs = findall_many(RUN, [_text(value) for value in values])
+    return [list(dict.fromkeys(number for run in found for number in _run_numbers(run))) for found in runs]
+def encode(number: str) -> int:
+    """
+    Returns the compact integer encoding of a national number, its E.164 digits.
+    Args:
+        number (str): The 9-digit national number.
+    Returns:
+        int: The encoded number, e.g. 221771234567.
+    """
+    if national(number) != number:
+        raise ValueError(f'not a national number: {number!r}')
+    return int(COUNTRY + number)
+def decode(code: int) -> str:
+    """
+    Returns the national number of an integer encoding.
+    Args:
+        code (int): The encoded number.
+    Returns:
+        str: The 9-digit national number.
+    """
+    return str(code)[len(COUNTRY):]
@@ -0,0 +1,194 @@
+"""
+Module for adaptive per-site selector profiles.
+Only a few of the generic xpath alternatives of css.ini ever match on a given site. A profile
+records which alternatives produce values for each (site, field), prunes the others once it is
+warmed up, persists what it learned and falls back to the full list when the pruned
+alternatives stop matching.
+Classes:
+    SiteProfile: Selector profile of a site learned from hit statistics.
+Example:
+    >>> profile = SiteProfile('expat-dakar', warmup=20)
+    >>> page = MainPage(response, profile=profile)
+"""
+from collections import Counter, defaultdict, deque
+from os import makedirs, path
+import json
+import threading
+from .XPaths import XPathCache
+class SiteProfile:
+    """
+    Selector profile of a site learned from hit statistics.
+    Alternatives are tracked per '<Class>:<paths>' key, e.g. 'ProductTitle:relative_xpaths'.
+    Attributes:
+        name (str): The name of the site.
+        file (str): The path of the file the profile is persisted to.
+        warmup (int): The number of pages evaluated with every alternative before pruning.
+        min_hit_rate (float): The hit rate under which a pruned key falls back to every alternative.
+        window (int): The number of recent lookups the hit rate is computed on.
+        pages (int): The number of pages seen.
+        hits (defaultdict): Counters of matches per alternative index, per key.
+        kept (dict): The alternative indices kept per pruned key, most frequent first.
+    Methods:
+        new_page: Counts a new page and prunes the keys whose warm-up is over.
+        extract: Evaluates the paths of a Field or Page through the profile.
+        prune: Prunes the warmed-up keys to the alternatives that matched.
+        load: Loads the persisted profile.
+        save: Persists the profile.
+    """
+    def __init__(self,
+                 name: str,
+                 warmup: int = 20,
+                 min_hit_rate: float = 0.9,
+                 window: int = 50,
+                 directory: str = 'profiles') -> None:
+        """
+        Initializes a SiteProfile, loading its persisted state if any.
+        Args:
+            name (str): The name of the site.
+            warmup (int, optional): Pages evaluated with every alternative before pruning. Defaults to 20.
+            min_hit_rate (float, optional): Hit rate under which a key falls back. Defaults to 0.9.
+            window (int, optional): Number of recent lookups of the hit rate. Defaults to 50.
+            directory (str, optional): Directory of the profile files. Defaults to 'profiles'.
+        """
+        self.name = name
+        self.file = path.join(directory, f'{name}.json')
+        self.warmup = warmup
+        self.min_hit_rate = min_hit_rate
+        self.window = window
+        self.pages = 0
+        self.hits = defaultdict(Counter)
+        self.kept = {}
+        self._since = {}
+        self._recent = defaultdict(lambda: deque(maxlen=self.window))
+        self._alternatives = {}
+        self._persisted = {}
+        self._lock = threading.Lock()
+        self.load()
+    @staticmethod
+    def key(owner, paths: str) -> str:
+        """
+        Returns the key under which the alternatives of an object are tracked.
+        Args:
+            owner: The Field or Page instance holding the paths.
+            paths (str): The name of the attribute holding the paths.
+        Returns:
+            str: The key.
+        """
+        return f'{owner}:{paths}'
+    def new_page(self) -> None:
+        """
+        Counts a new page and prunes the keys whose warm-up is over.
+        """
+        with self._lock:
+            self.pages += 1
+            ready = [
+                key for key in self._alternatives
+                if key not in self.kept and self.pages - self._since[key] >= self.warmup]
+        if ready:
+            self.prune(ready)
+    def extract(self, owner, paths: str, root, first_match: bool = False) -> list:
+        """
+        Evaluates the paths of a Field or Page through the profile.
+        Args:
+            owner: The Field or Page instance holding the paths.
+            paths (str): The name of the attribute holding the paths.
+            root: The lxml element to evaluate the paths on.
+            first_match (bool, optional): Whether to stop at the first matching alternative, setting the
+                skipped attribute of the owner to the number of alternatives not evaluated. Defaults to False.
+        Returns:
+            list: The raw XPath results.
+        """
+        key = self.key(owner, paths)
+        if key not in self._alternatives:
+            self._discover(key, getattr(owner, paths))
+        kept = self.kept.get(key)
+        if kept is None:
+            out, matched = self._evaluate(owner, paths, root, first_match)
+            with self._lock:
+                self.hits[key].update(matched)
+            return out
+        out = self._evaluate_kept(owner, paths, root, kept, first_match)
+        if out:
+            self._record(key, True)
+            return out
+        out, _ = self._evaluate(owner, paths, root, first_match)
+        if out:
+            self._record(key, False)
+        return out
+    @staticmethod
+    def _evaluate(owner, paths, root, first_match):
+        alternatives = XPathCache.alternatives(owner, paths)
+        if first_match:
+            out, owner.skipped = XPathCache.first(alternatives, root)
+            return out, [len(alternatives) - owner.skipped - 1] if out else []
+        matched = [ix for ix, alternative in enumerate(alternatives) if alternative(root)]
+        out = XPathCache.get(owner, paths)(root) if matched else []
+        return out, matched
+    @staticmethod
+    def _evaluate_kept(owner, paths, root, kept, first_match):
+        if first_match:
+            alternatives = XPathCache.alternatives(owner, paths)
+            out, owner.skipped = XPathCache.first([alternatives[ix] for ix in kept], root, len(alternatives))
+            return out
+        return XPathCache.subset(owner, paths, tuple(sorted(kept)))(root)
+    def _record(self, key, hit):
+        with self._lock:
+            recent = self._recent[key]
+            recent.append(hit)
+            fallback = len(recent) == recent.maxlen and sum(recent) / len(recent) < self.min_hit_rate
+            if fallback:
+                del self.kept[key]
+                self.hits.pop(key, None)
+                self._recent.pop(key, None)
+                self._since[key] = self.pages
+        if fallback:
+            self.save()
+    def prune(self, keys=None) -> None:
+        """
+        Prunes the warmed-up keys to the alternatives that matched, most frequent first.
+        Keys with no match at all keep every alternative and start a new warm-up.
+        Args:
+            keys (list, optional): The keys to prune. Defaults to every key with hits.
+        """
+        with self._lock:
+            for key in list(self.hits) if keys is None else keys:
+                hits = self.hits.get(key)
+                if hits:
+                    self.kept[key] = tuple(ix for ix, _ in hits.most_common())
+                    self._recent.pop(key, None)
+                else:
+                    self._since[key] = self.pages
+        self.save()
+    def load(self) -> None:
+        """
+        Loads the persisted profile. Alternatives are persisted as xpaths and mapped back to the
+        indices of the current configuration, so the ones that no longer exist are dropped.
+        """
+        if not path.exists(self.file):
+            return
+        with open(self.file) as profile_file:
+            state = json.load(profile_file)
+        self.pages = state.get('pages', 0)
+        self._persisted = state.get('kept', {})
+    def _discover(self, key, alternatives):
+        with self._lock:
+            self._alternatives[key] = alternatives
+            self._since[key] = self.pages
+            index = {alternative: ix for ix, alternative in enumerate(alternatives)}
+            kept = tuple(index[alternative] for alternative in self._persisted.get(key, []) if alternative in index)
+            if kept:
+                self.kept[key] = kept
+    def save(self) -> None:
+        """
+        Persists the profile.
+        """
+        with self._lock:
+            state = {
+                'name': self.name,
+                'pages': self.pages,
+                'kept': {
+                    key: [self._alternatives[key][ix] for ix in kept]
+                    for key, kept in self.kept.items()}}
+        makedirs(path.dirname(self.file) or '.', exist_ok=True)
+        with open(self.file, 'w') as profile_file:
+            json.dump(state, profile_file, indent=2)
@@ -0,0 +1,254 @@
+"""
+Module for the records parsed from items.
+Classes:
+    MappedData: Represents mapped data with a specific name and fields.
+    LazyData: Mapped data whose fields are evaluated on first access.
+Attributes:
+    RECORD_TYPES (dict): Field types given as classes rather than names, by name.
+Example:
+    >>> record = MappedData('MainItem', [('ProductTitle', 'str', 'Centre d\'Appels')])
+    >>> record.to_flat()['ProductTitle']
+    "Centre d'Appels"
+"""
+from collections import OrderedDict
+from dataclasses import make_dataclass, fields as dataclass_fields
+from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+import json
+import marshal
+# Field types given as classes rather than names, restored by name when records are unpacked.
+RECORD_TYPES = {'datetime': datetime}
+class MappedData:
+    """
+    Represents mapped data with a specific name and fields.
+    Records are compact: the wrapper and the dataclass instance both use __slots__, and the
+    field names and types live on the dataclass type shared by every record of a schema.
+    Attributes:
+        name (str): The name of the mapped data.
+        fields (list): A list of (name, type, value) tuples for the dataclass.
+        dataclass: The constructed dataclass object representing the mapped data.
+    Methods:
+        __init__: Initializes a MappedData object with the provided name and fields.
+        record_class: Returns the dataclass type of a schema, built once per schema.
+        to_dict: Returns the dataclass as a dictionary.
+        to_flat: Returns the fields as a read-only flat mapping, built once per record.
+        to_json: Returns the fields encoded as JSON bytes, built once per record.
+        __rshift__: Pushes the string representation of the dataclass to a consumer.
+        __reduce__: Pickles the record by its name and fields, as record types are built at runtime.
+        pack: Encodes records of one schema into a compact binary batch.
+        unpack: Decodes a binary batch into records.
+    """
+    __slots__ = ('dataclass', '_flat', '_json')
+    def __init__(self, name, fields):
+        """
+        Initializes a MappedData object with the provided name and fields.
+        Args:
+            name (str): The name of the mapped data.
+            fields (list): A list of (name, type, value) tuples for the dataclass.
+        """
+        schema = tuple((field_name, kind) for field_name, kind, _ in fields)
+        self.dataclass = self.record_class(name, schema)(*(value for _, _, value in fields))
+        self._flat = None
+        self._json = None
+    @property
+    def name(self) -> str:
+        """
+        Property returning the name of the mapped data.
+        Returns:
+            str: The name of the dataclass type.
+        """
+        return type(self.dataclass).__name__
+    @property
+    def fields(self) -> list:
+        """
+        Property returning the fields of the mapped data.
+        Returns:
+            list: A list of (name, type, value) tuples.
+        """
+        return [(field.name, field.type, getattr(self.dataclass, field.name))
+                for field in dataclass_fields(self.dataclass)]
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def record_class(name: str, schema: tuple) -> type:
+        """
+        Returns the dataclass type of a schema, built once per schema.
+        Args:
+            name (str): The name of the dataclass.
+            schema (tuple): (field name, type) pairs.
+        Returns:
+            type: The dataclass type, with __slots__.
+        """
+        return make_dataclass(name, schema, namespace={'__slots__': tuple(field_name for field_name, _ in schema)})
+    def __reduce__(self):
+        """
+        Pickles the record by its name and fields, so it is rebuilt on the record type of the
+        receiving process.
+        Returns:
+            tuple: The MappedData class and its constructor arguments.
+        """
+        return (MappedData, (self.name, self.fields))
+    def to_dict(self):
+        """
+        Returns the dataclass as a dictionary.
+        Returns:
+            dict: The dataclass represented as a dictionary.
+        """
+        return OrderedDict(self.to_flat())
+    def to_flat(self) -> MappingProxyType:
+        """
+        Returns the fields as a flat mapping, read once from the dataclass slots and cached.
+        The mapping is shared by every consumer of the record, so it is read-only: copy it with
+        dict() to get a mapping that can be changed.
+        Returns:
+            MappingProxyType: The field values keyed by field name.
+        """
+        if self._flat is None:
+            dataclass = self.dataclass
+            self._flat = MappingProxyType({name: getattr(dataclass, name) for name in dataclass.__slots__})
+        return self._flat
+    def to_json(self) -> bytes:
+        """
+        Returns the fields encoded as JSON bytes, encoded once and cached.
+        Returns:
+            bytes: The JSON encoded record.
+        """
+        if self._json is None:
+            self._json = json.dumps(dict(self.to_flat()), ensure_ascii=False, separators=(',', ':')).encode()
+        return self._json
+    def __rshift__(self, cursor):
+        """
+        Pushes the string representation of the dataclass to a consumer.
+        Args:
+            cursor: The consumer object to which the data is pushed.
+        """
+        cursor.push(self)
+    @staticmethod
+    def pack(records: list) -> bytes:
+        """
+        Encodes records of one schema into a compact binary batch: the schema once, followed by
+        one tuple of values per record, marshalled.
+        Args:
+            records (list): The records, sharing the schema of the first one.
+        Returns:
+            bytes: The binary batch.
+        """
+        if not records:
+            return marshal.dumps(None)
+        first = records[0]
+        schema = tuple(
+            (field.name, field.type if isinstance(field.type, str) else field.type.__name__)
+            for field in dataclass_fields(first.dataclass))
+        return marshal.dumps((first.name, schema, tuple(tuple(record.to_flat().values()) for record in records)))
+    @staticmethod
+    def unpack(batch: bytes) -> list:
+        """
+        Decodes a binary batch into records.
+        Args:
+            batch (bytes): The binary batch returned by pack.
+        Returns:
+            list: The MappedData records.
+        """
+        packed = marshal.loads(batch)
+        if packed is None:
+            return []
+        name, schema, rows = packed
+        schema = [(field_name, RECORD_TYPES.get(kind, kind)) for field_name, kind in schema]
+        return [MappedData(name, [(field_name, kind, value) for (field_name, kind), value in zip(schema, row)])
+                for row in rows]
+class LazyData:
+    """
+    Represents mapped data whose fields are evaluated on first access.
+    Each field is extracted and formatted at most once, and every field is only evaluated when the
+    record is materialized by to_dict, dataclass or a push to a cursor. Filters can therefore drop
+    a record after reading a cheap field without paying for the others.
+    Attributes:
+        name (str): The name of the mapped data.
+    Methods:
+        __init__: Initializes a LazyData object with the fields to evaluate.
+        __getattr__: Evaluates a field on first access.
+        materialize: Evaluates every field and returns the equivalent MappedData.
+        dataclass: Property returning the materialized dataclass.
+        to_dict: Returns the materialized fields as a dictionary.
+        to_flat: Returns the materialized fields as a flat mapping.
+        to_json: Returns the materialized fields encoded as JSON bytes.
+        __rshift__: Pushes the record to a consumer.
+    """
+    def __init__(self, name, fields, created_at):
+        """
+        Initializes a LazyData object with the fields to evaluate.
+        Args:
+            name (str): The name of the mapped data.
+            fields (list): (name, type name, field instance, method) tuples for each field.
+            created_at (str): The creation date of the record.
+        """
+        self.name = name
+        self._fields = fields
+        self._values = {'CreatedAt': created_at}
+        self._mapped = None
+    def __getattr__(self, val):
+        """
+        Evaluates a field on first access.
+        Args:
+            val (str): The name of the field.
+        Returns:
+            Any: The formatted value of the field.
+        """
+        if val.startswith('_'):
+            raise AttributeError(val)
+        values = self._values
+        if val not in values:
+            for name, _, field, method in self._fields:
+                if name == val:
+                    values[val] = getattr(field, method)
+                    break
+            else:
+                raise AttributeError(val)
+        return values[val]
+    def materialize(self) -> MappedData:
+        """
+        Evaluates every field and returns the equivalent MappedData, built once.
+        Returns:
+            MappedData: The materialized record.
+        """
+        if self._mapped is None:
+            self._mapped = MappedData(self.name, [
+                (name, kind, getattr(self, name)) for name, kind, _, _ in self._fields
+            ] + [('CreatedAt', datetime, self._values['CreatedAt'])])
+        return self._mapped
+    @property
+    def dataclass(self):
+        """
+        Property returning the materialized dataclass.
+        Returns:
+            dataclass: The dataclass object representing the record.
+        """
+        return self.materialize().dataclass
+    def to_dict(self):
+        """
+        Returns the materialized fields as a dictionary.
+        Returns:
+            dict: The record represented as a dictionary.
+        """
+        return self.materialize().to_dict()
+    def to_flat(self):
+        """
+        Returns the materialized fields as a flat mapping.
+        Returns:
+            MappingProxyType: The field values keyed by field name.
+        """
+        return self.materialize().to_flat()
+    def to_json(self):
+        """
+        Returns the materialized fields encoded as JSON bytes.
+        Returns:
+            bytes: The JSON encoded record.
+        """
+        return self.materialize().to_json()
+    def __rshift__(self, cursor):
+        """
+        Pushes the record to a consumer.
+        Args:
+            cursor: The consumer object to which the data is pushed.
+        """
+        cursor.push(self)
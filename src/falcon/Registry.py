@@ -0,0 +1,164 @@
+"""
+Module for registries of site definitions.
+A registry streams site definitions, as (name, kwargs) pairs of MainSite arguments, from a JSONL
+or CSV file or from a list. Definitions are read on iteration and never held all at once, and
+every iteration opens its own reader, so consumers do not share any state.
+JSONL lines hold the name and the arguments of a site:
+    {"name": "expat-dakar-voitures", "start_urls": ["https://www.expat-dakar.com/voitures"], "follow": true}
+CSV files have a 'name' column and a 'start_urls' column of space separated URLs; a 'fields'
+column is split the same way, 'follow', 'profile' and 'watermark' are read as booleans and
+'window' and 'max_in_flight' as integers. Empty cells take the default of their argument, and
+other columns are rejected, as CSV cells are strings.
+Classes:
+    SiteRegistry: Lazily loaded registry of site definitions.
+Functions:
+    domain: Returns the domain of a site definition.
+Example:
+    >>> registry = SiteRegistry('sites.jsonl').select(domains=['expat-dakar.com']).partition(0, 4)
+    >>> sites = MultipleSites(registry)
+"""
+from itertools import islice
+from urllib.parse import urlparse
+from zlib import crc32
+import csv
+import json
+LIST_COLUMNS = ('start_urls', 'fields')
+BOOL_COLUMNS = ('follow', 'profile', 'watermark')
+INT_COLUMNS = ('window', 'max_in_flight')
+def domain(kwargs: dict) -> str:
+    """
+    Returns the domain of a site definition, from its first start URL, without 'www.'.
+    Args:
+        kwargs (dict): The arguments of the site.
+    Returns:
+        str: The domain, or '' if the site has no start URL.
+    """
+    urls = kwargs.get('start_urls') or ['']
+    host = urlparse(urls[0]).hostname or ''
+    return host[4:] if host.startswith('www.') else host
+class SiteRegistry:
+    """
+    Lazily loaded registry of site definitions.
+    Attributes:
+        source (Union[str, list]): The path of the JSONL or CSV file, or a list of (name, kwargs) pairs.
+        names (frozenset): The names the definitions are restricted to, None for every name.
+        domains (frozenset): The domains the definitions are restricted to, None for every domain.
+        shard (tuple): The (index, count, key) of the partition the definitions are restricted to, if any.
+    Methods:
+        select: Returns the registry restricted to names or domains.
+        partition: Returns the registry restricted to one partition of the sites.
+        __iter__: Streams the (name, kwargs) definitions.
+        __len__: Counts the definitions.
+        __getitem__: Returns the definition at an index.
+    """
+    def __init__(self, source, names=None, domains=None, shard: tuple = None) -> None:
+        """
+        Initializes a SiteRegistry.
+        Args:
+            source (Union[str, list]): The path of a '.jsonl' or '.csv' file, or a list of (name, kwargs) pairs.
+            names (list, optional): The names to keep. Defaults to None, for every name.
+            domains (list, optional): The domains to keep. Defaults to None, for every domain.
+            shard (tuple, optional): The (index, count, key) partition to keep. Defaults to None.
+        """
+        self.source = source
+        self.names = None if names is None else frozenset(names)
+        self.domains = None if domains is None else frozenset(domains)
+        self.shard = shard
+    def select(self, names=None, domains=None):
+        """
+        Returns the registry restricted to names or domains, on top of the current restrictions.
+        Args:
+            names (list, optional): The names to keep. Defaults to None, for every name.
+            domains (list, optional): The domains to keep. Defaults to None, for every domain.
+        Returns:
+            SiteRegistry: The restricted registry.
+        """
+        if names is not None and self.names is not None:
+            names = self.names & set(names)
+        if domains is not None and self.domains is not None:
+            domains = self.domains & set(domains)
+        return SiteRegistry(
+            self.source, self.names if names is None else names, self.domains if domains is None else domains,
+            self.shard)
+    def partition(self, index: int, count: int, key: str = 'domain'):
+        """
+        Returns the registry restricted to one partition of the sites, by the crc32 hash of their
+        domain or name, so every process of a crawl can take its share of a common file.
+        Args:
+            index (int): The index of the partition, from 0 to count - 1.
+            count (int): The number of partitions.
+            key (str, optional): 'domain' to keep the sites of a domain together, or 'name'. Defaults to 'domain'.
+        Returns:
+            SiteRegistry: The restricted registry.
+        Raises:
+            ValueError: If the index or the key is invalid.
+        """
+        if not 0 <= index < count or key not in ('domain', 'name'):
+            raise ValueError(f'invalid partition {index}/{count} by {key!r}')
+        return SiteRegistry(self.source, self.names, self.domains, (index, count, key))
+    def _read(self):
+        if not isinstance(self.source, str):
+            yield from self.source
+        elif self.source.endswith('.csv'):
+            with open(self.source, newline='') as source_file:
+                reader = csv.DictReader(source_file)
+                unknown = set(reader.fieldnames or []) - {'name', *LIST_COLUMNS, *BOOL_COLUMNS, *INT_COLUMNS}
+                if unknown:
+                    raise ValueError(f'{self.source}: unknown columns {sorted(unknown)}')
+                for row in reader:
+                    name = row.pop('name')
+                    kwargs = {}
+                    for column, value in row.items():
+                        value = (value or '').strip()
+                        if column in LIST_COLUMNS:
+                            kwargs[column] = value.split() or None
+                        elif not value:
+                            continue
+                        elif column in BOOL_COLUMNS:
+                            kwargs[column] = value.lower() in ('1', 'true', 'yes')
+                        else:
+                            kwargs[column] = int(value)
+                    yield name, kwargs
+        else:
+            with open(self.source) as source_file:
+                for line in source_file:
+                    if line.strip():
+                        kwargs = json.loads(line)
+                        yield kwargs.pop('name'), kwargs
+    def _keep(self, name, kwargs) -> bool:
+        if self.names is not None and name not in self.names:
+            return False
+        if self.domains is not None and domain(kwargs) not in self.domains:
+            return False
+        if self.shard is not None:
+            index, count, key = self.shard
+            value = domain(kwargs) if key == 'domain' else name
+            return crc32(value.encode()) % count == index
+        return True
+    def __iter__(self):
+        """
+        Streams the (name, kwargs) definitions kept by the registry, from a new reader.
+        Returns:
+            iterator: The definitions.
+        """
+        return ((name, kwargs) for name, kwargs in self._read() if self._keep(name, kwargs))
+    def __len__(self) -> int:
+        """
+        Counts the definitions kept by the registry, reading the source once.
+        Returns:
+            int: The number of definitions.
+        """
+        return sum(1 for _ in self)
+    def __getitem__(self, ix: int) -> tuple:
+        """
+        Returns the definition at an index, reading the source up to it.
+        Args:
+            ix (int): The index of the definition.
+        Returns:
+            tuple: The (name, kwargs) definition.
+        Raises:
+            IndexError: If there are not that many definitions.
+        """
+        for definition in islice(self, ix, None):
+            return definition
+        raise IndexError(ix)
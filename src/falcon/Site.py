@@ -4,6 +4,10 @@ This module defines classes representing websites and multiple websites.
 Classes:
     MainSite: Represents a main website with attributes and methods for web crawling.
     MultipleSites: Represents multiple websites with methods for iteration and retrieval.
+Functions:
+    shard: Partitions weighted items into balanced shards.
+    merge_stats: Merges the stats of several crawlers.
+    site_spec: Returns a site definition that can be sent to a crawler process.
 Example:
     >>> sites_data = {
     ...     'Site1': {'start_urls': ['url1', 'url2']},
@@ -16,9 +20,98 @@ Example:
     'Site1'
     'Site2'
 """
+from datetime import datetime
 from functools import cached_property
+from os import cpu_count, makedirs, path, replace
+import heapq
+import json
+import multiprocessing
 from .Model import Site
 from .Page import MainPage
+from .Profile import SiteProfile
+from .Registry import SiteRegistry
+from .Watermark import Watermark
+from .Workers import ParsePool
+def shard(weights: list, shards: int) -> list[list[int]]:
+    """
+    Partitions weighted items into balanced shards, assigning the heaviest items first to the
+    lightest shard (longest processing time first).
+    Args:
+        weights (list): The weight of each item.
+        shards (int): The number of shards.
+    Returns:
+        list: The indices of the items of each shard, without the empty shards.
+    """
+    heap = [(0, ix, []) for ix in range(shards)]
+    for item in sorted(range(len(weights)), key=lambda item: -weights[item]):
+        load, ix, items = heapq.heappop(heap)
+        items.append(item)
+        heapq.heappush(heap, (load + weights[item], ix, items))
+    return [sorted(items) for _, _, items in sorted(heap, key=lambda entry: entry[1]) if items]
+def merge_stats(stats: list[dict]) -> dict:
+    """
+    Merges the stats of several crawlers: counters are summed, memory usages take their maximum,
+    the earliest start time and the latest finish time are kept, the elapsed time is recomputed
+    from them and the other values are taken from the last crawler.
+    Args:
+        stats (list): The stats of each crawler.
+    Returns:
+        dict: The merged stats.
+    """
+    merged = {}
+    for crawler_stats in stats:
+        for key, value in crawler_stats.items():
+            if key not in merged:
+                merged[key] = value
+            elif isinstance(value, datetime):
+                merged[key] = (min if key == 'start_time' else max)(merged[key], value)
+            elif key.startswith('memusage/'):
+                merged[key] = max(merged[key], value)
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] += value
+            else:
+                merged[key] = value
+    if 'elapsed_time_seconds' in merged and 'start_time' in merged and 'finish_time' in merged:
+        merged['elapsed_time_seconds'] = (merged['finish_time'] - merged['start_time']).total_seconds()
+    return merged
+def site_spec(name: str, kwargs: dict) -> tuple:
+    """
+    Returns a site definition that can be sent to a crawler process, which builds its cursor,
+    profile and watermark: a SiteProfile or a Watermark is replaced by the dict of its arguments.
+    Args:
+        name (str): The name of the website.
+        kwargs (dict): The other arguments of the MainSite.
+    Returns:
+        tuple: The (name, kwargs) definition.
+    Raises:
+        TypeError: If the definition holds a cursor or a pool, which are not sent to another process.
+    """
+    kwargs = dict(kwargs)
+    profile, watermark = kwargs.get('profile'), kwargs.get('watermark')
+    if isinstance(profile, SiteProfile):
+        kwargs['profile'] = {
+            'warmup': profile.warmup, 'min_hit_rate': profile.min_hit_rate, 'window': profile.window,
+            'directory': path.dirname(profile.file)}
+    if isinstance(watermark, Watermark):
+        kwargs['watermark'] = {'keep': watermark.keep, 'directory': path.dirname(watermark.file)}
+    if kwargs.get('db') is not None and not isinstance(kwargs['db'], tuple):
+        raise TypeError(f'{name}: pass the db as a (cursor class, kwargs) pair to crawl in processes')
+    if kwargs.get('pool') is not None:
+        raise TypeError(f'{name}: set the parse_workers of MultipleSites to parse in a pool in processes')
+    return name, kwargs
+def _crawl_shard(sites, parse_workers, indices, settings, connection) -> None:
+    from scrapy.crawler import CrawlerProcess
+    indices = set(indices)
+    # Only the sites of the shard are built, with their cursors, profiles and watermarks.
+    definitions = [definition for ix, definition in enumerate(sites) if ix in indices]
+    process = CrawlerProcess(settings)
+    crawlers = {}
+    for site in MultipleSites(definitions, parse_workers):
+        crawlers[site.name] = process.create_crawler(site.spider)
+        process.crawl(crawlers[site.name])
+    process.start()
+    connection.send({name: crawler.stats.get_stats() for name, crawler in crawlers.items()})
+    connection.close()
 class MainSite(Site):
     """
     A class representing a main website.
@@ -26,6 +119,12 @@ class MainSite(Site):
         name (str): The name of the main website.
         start_urls (list): A list of starting URLs for the web crawler.
         db (str, optional): The database connection string. Defaults to None.
+        profile (SiteProfile, optional): The selector profile of the main website. Defaults to None.
+        fields (list, optional): The names of the fields to parse. Defaults to every field.
+        pool (ParsePool, optional): The worker pool pages are parsed in. Defaults to None.
+        max_in_flight (int, optional): The maximum number of pages sent to the pool at once.
+        window (int, optional): The number of numbered pages requested ahead. Defaults to 0.
+        watermark (Watermark, optional): The watermark of the categories of the main website. Defaults to None.
     Methods:
         __init__: Initializes a MainSite object with the provided attributes.
     """
@@ -33,59 +132,107 @@ class MainSite(Site):
                  name,
                  start_urls,
                  db=None,
-                 follow=True) -> None:
+                 follow=True,
+                 profile=None,
+                 fields=None,
+                 pool=None,
+                 max_in_flight=None,
+                 window=0,
+                 watermark=None) -> None:
         """
         Initializes a MainSite object.
         Args:
             name (str): The name of the main website.
             start_urls (list): A list of starting URLs for the web crawler.
-            db (str, optional): The database connection string. Defaults to None.
+            db (Union[Cursor, tuple], optional): The cursor the items are pushed to, or a (cursor class, kwargs)
+                pair to build it from. Defaults to None.
+            follow (bool, optional): Whether to follow the next page links. Defaults to True.
+            profile (Union[bool, dict, SiteProfile], optional): The selector profile of the website, True to
+                use the profile persisted under the website's name, or a dict of the other SiteProfile
+                arguments. Defaults to None.
+            fields (list, optional): The names of the fields to parse, e.g. ['PublishLink', 'ProductPrice']
+                for price monitoring. Defaults to every field.
+            pool (ParsePool, optional): The worker pool the response bodies are parsed in, so parsing
+                does not run on the reactor thread. Workers parse with the default selectors, so a pool
+                cannot be combined with a profile. Defaults to None.
+            max_in_flight (int, optional): The maximum number of pages sent to the pool at once.
+                Defaults to twice the number of workers.
+            window (int, optional): The number of pages requested ahead of the last page parsed, when
+                the next page links number the pages ('?page=3', '/page/3'). Requests stop at the first
+                empty or repeated page. Defaults to 0, to follow the next page links one by one.
+            watermark (Union[bool, dict, Watermark], optional): The watermark of the categories of the website,
+                True to use the watermark persisted under the website's name, or a dict of the other Watermark
+                arguments. Pagination stops at the first page
+                whose listings were all crawled by a previous run, or are older than its newest listing.
+                Defaults to None, to crawl every page.
+        Raises:
+            ValueError: If both a pool and a profile are given, or if fields leave out a field the cursor reads.
         """
+        if pool is not None and profile:
+            raise ValueError(f'{name}: a selector profile is not applied by the parse pool, use one or the other')
         self.name: str = name
         self.start_urls: list = start_urls
         self.pageclass = MainPage
+        if isinstance(db, tuple):
+            cursor, kwargs = db
+            db = cursor(**kwargs)
+        missing = [] if fields is None else [field for field in getattr(db, 'required_fields', ()) if field not in fields]
+        if missing:
+            raise ValueError(f'{name}: the cursor {type(db).__name__} reads the fields {missing}, add them to fields')
         if db:
             self.Db: str = db
         self.follow = follow
+        if profile is True or isinstance(profile, dict):
+            profile = SiteProfile(name, **(profile if isinstance(profile, dict) else {}))
+        self.profile = profile
+        self.fields = fields
+        self.pool = pool
+        self.max_in_flight = max_in_flight
+        self.window = window
+        if watermark is True or isinstance(watermark, dict):
+            watermark = Watermark(name, **(watermark if isinstance(watermark, dict) else {}))
+        self.watermark = watermark
 class MultipleSites:
     """
     A class representing multiple websites.
+    Iterations are independent of each other, so several consumers can iterate the same sites.
     Attributes:
-        loop_state (int): Current state of iteration.
-        sites (dict): A dictionary containing lists of URLs for each website.
+        sites (Union[list, SiteRegistry]): The (name, kwargs) definitions of the websites, a list or a
+            registry streaming them from a file. A path to a '.jsonl' or '.csv' file is read as a registry.
         db (str, optional): The database connection string. Defaults to None.
+        parse_workers (int, optional): The number of workers of the parse pool the sites parse their
+            pages in. Defaults to None, to parse pages in the spiders.
     Methods:
+        pool: A property returning the parse pool shared by the sites.
         site_names: A property to retrieve the names of all sites.
+        run: Crawls the sites in several processes and merges their stats.
         __len__: Returns the number of sites.
-        __iter__: Returns an iterator object.
-        __next__: Returns the next site in iteration.
+        __iter__: Returns a new iterator over the sites.
         __getitem__: Returns the MainSite object corresponding to the given index.
+        site: Builds the MainSite of a definition.
     """
-    loop_state = 0
-    def __init__(self, sites: list[dict]):
+    def __init__(self, sites, parse_workers: int = None):
+        if isinstance(sites, str):
+            sites = SiteRegistry(sites)
         self.sites = sites
-    def __len__(self)->int:
-        return len(self.sites)
-    def __iter__(self):
+        self.parse_workers = parse_workers
+    @cached_property
+    def pool(self):
         """
-        Returns an iterator object.
+        A property returning the parse pool shared by the sites, forked on first access.
         Returns:
-            iterator: An iterator object.
+            ParsePool: The pool of page parsing workers.
         """
-        return self
-    def __next__(self):
+        return ParsePool(self.parse_workers)
+    def __len__(self)->int:
+        return len(self.sites)
+    def __iter__(self):
         """
-        Returns the next site in iteration.
+        Returns a new iterator over the sites, building each MainSite when it is reached.
         Returns:
-            MainSite: The next MainSite object.
-        Raises:
-            StopIteration: If all sites have been iterated.
+            iterator: An iterator of MainSite objects.
         """
-        if self.loop_state < len(self):
-            self.loop_state += 1
-            return self[self.loop_state - 1]
-        self.loop_state = 0
-        raise StopIteration
+        return (self.site(name, kwargs) for name, kwargs in self.sites)
     def __getitem__(self, ix):
         """
         Returns the MainSite object corresponding to the given index.
@@ -94,4 +241,83 @@ class MultipleSites:
         Returns:
             MainSite: The MainSite object at the specified index.
         """
-        return MainSite((site:=self.sites[ix])[0],**site[1])
+        return self.site(*self.sites[ix])
+    def site(self, name: str, kwargs: dict) -> MainSite:
+        """
+        Builds the MainSite of a definition, parsing its pages in the shared pool if any.
+        Args:
+            name (str): The name of the website.
+            kwargs (dict): The other arguments of the MainSite.
+        Returns:
+            MainSite: The MainSite object.
+        """
+        if self.parse_workers:
+            kwargs = {'pool': self.pool, **kwargs}
+        return MainSite(name, **kwargs)
+    def run(self,
+            workers: int = None,
+            history: str = 'crawl_history.json',
+            settings: dict = None,
+            start_method: str = 'spawn') -> dict:
+        """
+        Crawls the sites in several worker processes, each running its own CrawlerProcess, reactor
+        and cursors. Processes receive the definitions of the sites (see site_spec) and build their
+        cursors, profiles and watermarks themselves. Sites are partitioned by shard, balanced by the
+        number of pages each site returned in the previous run; sites with no history weigh the mean
+        of the others.
+        Args:
+            workers (int, optional): The number of crawler processes, not to be confused with the
+                parse_workers of the pool each process parses its pages in, if set. Defaults to the
+                number of CPUs.
+            history (str, optional): The JSON file of the page count of each site, read to balance
+                the processes and updated after the crawl, None to balance by number of sites.
+                Defaults to 'crawl_history.json'.
+            settings (dict, optional): The Scrapy settings of every CrawlerProcess. Defaults to None.
+            start_method (str, optional): The multiprocessing start method. Defaults to 'spawn', which
+                gives each process a fresh reactor.
+        Returns:
+            dict: The stats of each site under 'sites' and the merged stats under 'total'.
+        Raises:
+            TypeError: If a site definition cannot be sent to a crawler process.
+            RuntimeError: If a crawler process exits without returning its stats.
+        """
+        sites = self.sites if isinstance(self.sites, SiteRegistry) else [site_spec(*site) for site in self.sites]
+        names = [name for name, _ in sites]
+        pages = {}
+        if history and path.exists(history):
+            with open(history) as history_file:
+                pages = json.load(history_file)
+        known = [pages[name] for name in names if name in pages]
+        default = sum(known) / len(known) if known else 1
+        shards = shard([pages.get(name, default) for name in names], workers or cpu_count() or 1)
+        context = multiprocessing.get_context(start_method)
+        processes, stats = [], {}
+        try:
+            for indices in shards:
+                receiver, sender = context.Pipe(duplex=False)
+                process = context.Process(
+                    target=_crawl_shard, args=(sites, self.parse_workers, indices, settings, sender))
+                process.start()
+                sender.close()
+                processes.append((process, receiver))
+            for process, receiver in processes:
+                try:
+                    stats.update(receiver.recv())
+                except EOFError:
+                    process.join()
+                    raise RuntimeError(f'crawler process {process.pid} exited with code {process.exitcode}')
+                process.join()
+        finally:
+            # On failure, the other crawler processes are stopped rather than left running.
+            for process, receiver in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+                receiver.close()
+        if history:
+            pages.update({name: site_stats.get('response_received_count', 0) for name, site_stats in stats.items()})
+            makedirs(path.dirname(history) or '.', exist_ok=True)
+            with open(f'{history}.tmp', 'w') as history_file:
+                json.dump(pages, history_file, indent=2)
+            replace(f'{history}.tmp', history)
+        return {'sites': stats, 'total': merge_stats(list(stats.values()))}
@@ -0,0 +1,127 @@
+"""
+Module for incremental crawls with per-site watermarks.
+A watermark records, for each category of a site, the newest PublishDate and the most recent
+PublishLinks crawled. The next run stops paginating a category at the first page holding only
+listings it has already seen, or listings older than the newest date of the previous run.
+Categories are the listing URLs without their page number, so every page of a category shares
+its watermark. Pages are compared to the watermark loaded at the start of the run, and the
+listings of the run are persisted when the spider closes. Dates are compared as datetimes in
+UTC, dates without a timezone being read in the local time of the crawl.
+Classes:
+    Watermark: Persisted watermarks of the categories of a site.
+Functions:
+    category: Returns the category of a listing URL.
+Example:
+    >>> watermark = Watermark('expat-dakar')
+    >>> site = MainSite('expat-dakar', start_urls, watermark=watermark)
+"""
+from datetime import datetime, timezone
+from os import makedirs, path, replace
+from urllib.parse import urlsplit, urlunsplit
+import json
+import threading
+from .Pagination import PAGE_PATH, PAGE_QUERY
+def category(url: str) -> str:
+    """
+    Returns the category of a listing URL: the URL without its page number and fragment.
+    Args:
+        url (str): The URL of a listing page.
+    Returns:
+        str: The category, e.g. 'https://site.sn/voitures?sort=new' for 'https://site.sn/voitures?sort=new&page=3'.
+    """
+    parts = urlsplit(url)
+    query = PAGE_QUERY.sub('', parts.query).lstrip('&')
+    return urlunsplit(parts._replace(path=PAGE_PATH.sub('', parts.path).rstrip('/'), query=query, fragment=''))
+def _date(value) -> datetime:
+    try:
+        date = datetime.fromisoformat(value) if value else None
+    except (TypeError, ValueError):
+        return None
+    # astimezone reads naive dates in local time, so both kinds are compared in UTC.
+    return date.astimezone(timezone.utc) if date is not None else None
+class Watermark:
+    """
+    Persisted watermarks of the categories of a site.
+    Attributes:
+        name (str): The name of the site.
+        file (str): The path of the file the watermarks are persisted to.
+        keep (int): The number of recent links kept per category.
+        previous (dict): The watermarks of the previous run, as {'newest': date, 'links': set} per category.
+        current (dict): The watermarks of the run, as {'newest': date, 'links': dict} per category.
+    Methods:
+        update: Records the listings of a page and returns whether the page was already crawled.
+        load: Loads the persisted watermarks.
+        save: Persists the watermarks of the previous run advanced by the run.
+    """
+    def __init__(self, name: str, keep: int = 1000, directory: str = 'watermarks') -> None:
+        """
+        Initializes a Watermark, loading its persisted state if any.
+        Args:
+            name (str): The name of the site.
+            keep (int, optional): The number of recent links kept per category. Defaults to 1000.
+            directory (str, optional): Directory of the watermark files. Defaults to 'watermarks'.
+        """
+        self.name = name
+        self.file = path.join(directory, f'{name}.json')
+        self.keep = keep
+        self.previous = {}
+        self.current = {}
+        self._persisted = {}
+        self._lock = threading.Lock()
+        self.load()
+    def update(self, url: str, records: list) -> bool:
+        """
+        Records the listings of a page and returns whether the page was already crawled, i.e. every
+        listing is among the recent links or older than the newest date of the previous run.
+        Args:
+            url (str): The URL of the page.
+            records (list): The records of the page.
+        Returns:
+            bool: Whether pagination can stop at the page. False for a page without records.
+        """
+        key = category(url)
+        flats = [record.to_flat() for record in records]
+        with self._lock:
+            previous = self.previous.get(key)
+            current = self.current.setdefault(key, {'newest': None, 'links': {}})
+            for flat in flats:
+                date, link = flat.get('PublishDate'), flat.get('PublishLink')
+                if _date(date) and (current['newest'] is None or _date(date) > _date(current['newest'])):
+                    current['newest'] = date
+                if link:
+                    current['links'][link] = None
+        if previous is None or not flats:
+            return False
+        newest = _date(previous['newest'])
+        return all(
+            flat.get('PublishLink') in previous['links']
+            or bool(newest and _date(flat.get('PublishDate')) and _date(flat['PublishDate']) < newest)
+            for flat in flats)
+    def load(self) -> None:
+        """
+        Loads the persisted watermarks.
+        """
+        if not path.exists(self.file):
+            return
+        with open(self.file) as watermark_file:
+            self._persisted = json.load(watermark_file).get('categories', {})
+        self.previous = {
+            key: {'newest': state.get('newest'), 'links': set(state.get('links', []))}
+            for key, state in self._persisted.items()}
+    def save(self) -> None:
+        """
+        Persists the watermarks of the previous run advanced by the run: the newest of both dates
+        and the links of the run, in page order, followed by the most recent links of the previous run.
+        """
+        with self._lock:
+            categories = dict(self._persisted)
+            for key, current in self.current.items():
+                persisted = categories.get(key, {})
+                newest = max(filter(_date, [persisted.get('newest'), current['newest']]), key=_date, default=None)
+                links = list(current['links'])
+                links += [link for link in persisted.get('links', []) if link not in current['links']]
+                categories[key] = {'newest': newest, 'links': links[:self.keep]}
+        makedirs(path.dirname(self.file) or '.', exist_ok=True)
+        with open(f'{self.file}.tmp', 'w') as watermark_file:
+            json.dump({'name': self.name, 'categories': categories}, watermark_file, indent=2)
+        replace(f'{self.file}.tmp', self.file)
@@ -0,0 +1,313 @@
+"""
+Module for parsing pages in a pool of worker processes.
+The parser state is warmed up once in the parent process, before the workers are forked:
+imports, the frozen configuration plans, the compiled selectors and the dateparser fallback.
+Forked workers share that memory copy-on-write and only receive the HTML bodies to parse.
+Pools are created before the crawl starts, as forking a process that runs threads only
+copies the thread that forks.
+Bodies are either pickled to the workers or, with shared_memory, written once to a ring of
+shared memory slots that workers parse in place; bodies are pickled while every slot is in use.
+Workers return the records of a page as a compact binary batch (see MappedData.pack).
+Classes:
+    SharedRing: Ring of shared memory slots holding the bodies sent to the workers.
+    ParsePool: Pre-fork pool of page parsing workers.
+    PendingPage: Page sent to a worker, decoded in the parent once it is parsed.
+Functions:
+    warm_up: Builds the parser state of a page class.
+Example:
+    >>> with ParsePool(workers=4, shared_memory=True) as pool:
+    ...     records, next_url = pool.parse(response.body, response.url)
+"""
+from multiprocessing import shared_memory
+from os import cpu_count
+from queue import Empty, Queue
+from urllib.parse import urljoin
+import logging
+import multiprocessing
+from lxml import etree, html
+from parsel import Selector
+from .Dates import date_parser
+from .Records import MappedData
+from .Page import MainPage
+from .utils import get_root
+WARMUP_HTML = '<html><body><div></div></body></html>'
+_state: dict = {}
+def warm_up(pageclass=MainPage, fields=None) -> None:
+    """
+    Builds the parser state of a page class: the configuration plans, the compiled selectors of
+    the page and of its items, and the dateparser fallback.
+    Args:
+        pageclass (type, optional): The page class. Defaults to MainPage.
+        fields (list, optional): The names of the fields to parse. Defaults to every default field.
+    """
+    # The empty page fails to parse, which is not worth a warning per field.
+    disabled = logging.root.manager.disable
+    logging.disable(logging.WARNING)
+    try:
+        page = pageclass(Selector(text=WARMUP_HTML), fields=fields)
+        root = get_root(page.response)
+        page.as_item(root)
+        page.as_batch([root])
+    finally:
+        logging.disable(disabled)
+    date_parser.fallback.get_date_data('1 janvier 2024')
+def _initialize(pageclass, fields) -> None:
+    if _state.get('pageclass') is not pageclass:
+        warm_up(pageclass, fields)
+    _state['pageclass'] = pageclass
+    _state['segments'] = {}
+def _result(page, url) -> tuple:
+    return MappedData.pack(list(page)), urljoin(url, page.next) if page.next else None
+def _parse(body, url, encoding, fields) -> tuple:
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        body = bytes(body).decode(encoding, errors='replace')
+    return _result(_state['pageclass'](Selector(text=body, base_url=url), fields=fields), url)
+def _parse_shared(segment, offset, length, url, encoding, fields) -> tuple:
+    shm = _state['segments'].get(segment)
+    if shm is None:
+        shm = _state['segments'][segment] = shared_memory.SharedMemory(name=segment)
+    parser = html.HTMLParser(recover=True, encoding=encoding, huge_tree=True)
+    with shm.buf[offset:offset + length] as body:
+        # lxml reads the slot through the buffer protocol, the body is not copied to a bytes object.
+        root = etree.fromstring(body, parser=parser, base_url=url) if length else None
+    if root is None:
+        root = etree.fromstring(b'<html/>', parser=parser, base_url=url)
+    return _result(_state['pageclass'](root, fields=fields), url)
+class SharedRing:
+    """
+    Ring of shared memory slots holding the bodies sent to the workers.
+    A body is written once into a free slot and the slot is released when its page is parsed.
+    Writers never wait for a slot, which would block the reactor thread: with every slot in use,
+    the body is pickled instead.
+    Attributes:
+        slots (int): The number of slots.
+        slot_size (int): The size of a slot, in bytes.
+        name (str): The name of the shared memory segment.
+    Methods:
+        acquire: Writes a body into a free slot.
+        release: Frees a slot.
+        close: Frees the shared memory segment.
+    """
+    def __init__(self, slots: int, slot_size: int) -> None:
+        """
+        Initializes a SharedRing, creating its shared memory segment.
+        Args:
+            slots (int): The number of slots.
+            slot_size (int): The size of a slot, in bytes.
+        """
+        self.slots = slots
+        self.slot_size = slot_size
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * slot_size)
+        self.name = self._shm.name
+        self._free = Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+    def acquire(self, body: bytes) -> tuple:
+        """
+        Writes a body into a free slot, if any.
+        Args:
+            body (bytes): The body, at most slot_size bytes long.
+        Returns:
+            tuple: The slot, its offset and the length of the body, None if every slot is in use.
+        """
+        try:
+            slot = self._free.get_nowait()
+        except Empty:
+            return None
+        offset = slot * self.slot_size
+        self._shm.buf[offset:offset + len(body)] = body
+        return slot, offset, len(body)
+    def release(self, slot: int) -> None:
+        """
+        Frees a slot.
+        Args:
+            slot (int): The slot.
+        """
+        self._free.put(slot)
+    def close(self) -> None:
+        """
+        Frees the shared memory segment.
+        """
+        self._shm.close()
+        self._shm.unlink()
+class ParsePool:
+    """
+    Pre-fork pool of page parsing workers.
+    Attributes:
+        workers (int): The number of worker processes.
+        pageclass (type): The page class the bodies are parsed with.
+        fields (list): The names of the fields to parse by default, None for every default field.
+        start_method (str): The multiprocessing start method, 'fork' where available.
+        ring (SharedRing): The shared memory slots of the bodies, None to pickle the bodies.
+    Methods:
+        parse: Parses a page body in a worker.
+        parse_async: Parses a page body in a worker without waiting for the result.
+        map: Parses page bodies in the workers, in order.
+        pids: Property returning the process ids of the workers.
+        close: Stops the workers.
+    """
+    def __init__(self,
+                 workers: int = None,
+                 pageclass=MainPage,
+                 fields: list = None,
+                 start_method: str = None,
+                 shared_memory: bool = False,
+                 slots: int = None,
+                 slot_size: int = 1 << 21) -> None:
+        """
+        Initializes a ParsePool, warming up the parser state before starting the workers.
+        Args:
+            workers (int, optional): The number of worker processes. Defaults to the number of CPUs.
+            pageclass (type, optional): The page class the bodies are parsed with. Defaults to MainPage.
+            fields (list, optional): The names of the fields to parse by default. Defaults to every default field.
+            start_method (str, optional): The multiprocessing start method. Defaults to 'fork' where
+                available, 'spawn' otherwise. With 'spawn', each worker warms up on its own.
+            shared_memory (bool, optional): Whether to send bytes bodies through a SharedRing. Defaults to False.
+            slots (int, optional): The number of slots of the ring. Defaults to four per worker.
+            slot_size (int, optional): The size of a slot, larger bodies are pickled. Defaults to 2 MiB.
+        """
+        self.workers = workers or cpu_count() or 1
+        self.pageclass = pageclass
+        self.fields = fields
+        if start_method is None:
+            start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+        self.start_method = start_method
+        if start_method == 'fork':
+            _initialize(pageclass, fields)
+        self.ring = SharedRing(slots or 4 * self.workers, slot_size) if shared_memory else None
+        self._pool = multiprocessing.get_context(start_method).Pool(
+            self.workers, initializer=_initialize, initargs=(pageclass, fields))
+    def parse(self, body, url: str = '', encoding: str = 'utf-8', fields: list = None) -> tuple:
+        """
+        Parses a page body in a worker.
+        Args:
+            body (Union[bytes, str]): The HTML body of the page.
+            url (str, optional): The URL of the page, relative next links are joined to. Defaults to ''.
+            encoding (str, optional): The encoding of a bytes body. Defaults to 'utf-8'.
+            fields (list, optional): The names of the fields to parse. Defaults to the fields of the pool.
+        Returns:
+            tuple: The MappedData records of the page and the absolute URL of the next page, or None.
+        """
+        return self.parse_async(body, url, encoding, fields).get()
+    def parse_async(self, body, url: str = '', encoding: str = 'utf-8', fields: list = None,
+                    callback=None, error_callback=None):
+        """
+        Parses a page body in a worker without waiting for the result.
+        Args:
+            body (Union[bytes, str]): The HTML body of the page.
+            url (str, optional): The URL of the page. Defaults to ''.
+            encoding (str, optional): The encoding of a bytes body. Defaults to 'utf-8'.
+            fields (list, optional): The names of the fields to parse. Defaults to the fields of the pool.
+            callback (callable, optional): Called in the parent with the result of parse. Defaults to None.
+            error_callback (callable, optional): Called in the parent with the exception raised. Defaults to None.
+        Returns:
+            PendingPage: The pending page, whose get method returns the result of parse.
+        """
+        fields = self.fields if fields is None else fields
+        acquired = None
+        if self.ring is not None and not isinstance(body, str) and len(body) <= self.ring.slot_size:
+            acquired = self.ring.acquire(body)
+        if acquired is not None:
+            slot, offset, length = acquired
+            func, args = _parse_shared, (self.ring.name, offset, length, url, encoding, fields)
+        else:
+            slot, func, args = None, _parse, (body, url, encoding, fields)
+        pending = PendingPage(self.ring, slot, callback, error_callback)
+        try:
+            pending.result = self._pool.apply_async(func, args, callback=pending.done, error_callback=pending.failed)
+        except BaseException:
+            pending._release()
+            raise
+        return pending
+    def map(self, pages, encoding: str = 'utf-8', fields: list = None) -> list:
+        """
+        Parses page bodies in the workers, in order.
+        Args:
+            pages: Iterable of (body, url) pairs.
+            encoding (str, optional): The encoding of bytes bodies. Defaults to 'utf-8'.
+            fields (list, optional): The names of the fields to parse. Defaults to the fields of the pool.
+        Returns:
+            list: The result of parse for each page.
+        """
+        return [pending.get() for pending in [self.parse_async(body, url, encoding, fields) for body, url in pages]]
+    @property
+    def pids(self) -> list[int]:
+        """
+        Property returning the process ids of the workers.
+        Returns:
+            list: The process ids.
+        """
+        return [process.pid for process in self._pool._pool]
+    def close(self) -> None:
+        """
+        Stops the workers once the pending pages are parsed, and frees the shared memory.
+        """
+        self._pool.close()
+        self._pool.join()
+        if self.ring is not None:
+            self.ring.close()
+    def __enter__(self):
+        return self
+    def __exit__(self, *exc_info):
+        self.close()
+class PendingPage:
+    """
+    Page sent to a worker, whose records are decoded in the parent once it is parsed.
+    Attributes:
+        result (AsyncResult): The pending result of the worker.
+    Methods:
+        done: Frees the slot of the page and calls the callback with its records.
+        failed: Frees the slot of the page and calls the error callback.
+        get: Waits for the page and returns its records and next page URL.
+    """
+    def __init__(self, ring, slot, callback=None, error_callback=None) -> None:
+        """
+        Initializes a PendingPage.
+        Args:
+            ring (SharedRing): The ring holding the body, if any.
+            slot (int): The slot of the body in the ring, if any.
+            callback (callable, optional): Called with the decoded result. Defaults to None.
+            error_callback (callable, optional): Called with the exception raised. Defaults to None.
+        """
+        self.result = None
+        self._ring = ring
+        self._slot = slot
+        self._callback = callback
+        self._error_callback = error_callback
+        self._decoded = None
+    def _release(self) -> None:
+        if self._slot is not None:
+            self._ring.release(self._slot)
+            self._slot = None
+    def _decode(self, result) -> tuple:
+        if self._decoded is None:
+            batch, next_url = result
+            self._decoded = MappedData.unpack(batch), next_url
+        return self._decoded
+    def done(self, result) -> None:
+        """
+        Frees the slot of the page and calls the callback with its records.
+        Args:
+            result (tuple): The binary batch of the records and the next page URL.
+        """
+        self._release()
+        if self._callback is not None:
+            self._callback(self._decode(result))
+    def failed(self, error) -> None:
+        """
+        Frees the slot of the page and calls the error callback.
+        Args:
+            error (BaseException): The exception raised by the worker.
+        """
+        self._release()
+        if self._error_callback is not None:
+            self._error_callback(error)
+    def get(self, timeout: float = None) -> tuple:
+        """
+        Waits for the page and returns its records and next page URL.
+        Args:
+            timeout (float, optional): The number of seconds to wait. Defaults to None.
+        Returns:
+            tuple: The MappedData records of the page and the absolute URL of the next page, or None.
+        """
+        return self._decode(self.result.get(timeout))
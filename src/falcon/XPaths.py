@@ -0,0 +1,204 @@
+"""
+Module for compiling the XPath expressions of fields and pages.
+The paths of a Field or Page class are configured as lists of alternatives (see css.ini). They
+are compiled once per process, as one union or one expression per alternative, and shared by
+every instance of the class. The paths of several fields can also be compiled into one tagged
+expression, evaluated once per card, whose matches are split back out per field.
+Classes:
+    XPathCache: Process-wide cache of compiled XPath expressions.
+Example:
+    >>> XPathCache.get(field, 'relative_xpaths')(card)
+"""
+import threading
+from lxml import etree
+from .utils import POSITIONAL
+class XPathCache:
+    """
+    Process-wide cache of compiled XPath expressions.
+    Each (class, path kind) pair is joined and compiled into a single lxml XPath union
+    the first time it is used, and reused for the life of the process.
+    Attributes:
+        compiled (dict): Compiled expressions keyed by (class, path kind).
+        namespace (str): The namespace of the falcon XPath extension functions.
+    Methods:
+        get: Returns the compiled union of an object's paths.
+        alternatives: Returns the compiled paths of an object, one expression per alternative.
+        subset: Returns the compiled union of some of an object's paths.
+        anchorable: Whether an object's relative paths can be evaluated from the page root.
+        anchored: Returns the compiled union of an object's paths, keeping results attached to their nodes.
+        first: Evaluates compiled alternatives up to the first non-empty result.
+        tagged: Returns one compiled expression evaluating the paths of several fields.
+        split: Evaluates several fields with one tagged expression and splits the matches per field.
+    """
+    compiled: dict = {}
+    namespace: str = 'https://github.com/atkamara/falcon'
+    _local = threading.local()
+    @classmethod
+    def get(cls, owner, paths: str) -> etree.XPath:
+        """
+        Returns the compiled union of an object's paths, compiling it on first use.
+        Args:
+            owner: The Field or Page instance holding the paths.
+            paths (str): The name of the attribute holding the paths, e.g. 'xpaths'.
+        Returns:
+            etree.XPath: The compiled XPath union.
+        """
+        key = (owner.__class__, paths)
+        compiled = cls.compiled.get(key)
+        if compiled is None:
+            compiled = cls.compiled.setdefault(
+                key, etree.XPath('|'.join(getattr(owner, paths)), smart_strings=False))
+        return compiled
+    @classmethod
+    def alternatives(cls, owner, paths: str) -> tuple:
+        """
+        Returns the compiled paths of an object, one expression per alternative, compiling them on first use.
+        Args:
+            owner: The Field or Page instance holding the paths.
+            paths (str): The name of the attribute holding the paths, e.g. 'xpaths'.
+        Returns:
+            tuple: The compiled XPath expressions, in configuration order.
+        """
+        key = (owner.__class__, paths, 'alternatives')
+        compiled = cls.compiled.get(key)
+        if compiled is None:
+            compiled = cls.compiled.setdefault(
+                key, tuple(etree.XPath(path, smart_strings=False) for path in getattr(owner, paths)))
+        return compiled
+    @classmethod
+    def subset(cls, owner, paths: str, indices: tuple) -> etree.XPath:
+        """
+        Returns the compiled union of some of an object's paths, compiling it on first use.
+        Args:
+            owner: The Field or Page instance holding the paths.
+            paths (str): The name of the attribute holding the paths, e.g. 'xpaths'.
+            indices (tuple): The indices of the paths to keep.
+        Returns:
+            etree.XPath: The compiled XPath union.
+        """
+        key = (owner.__class__, paths, indices)
+        compiled = cls.compiled.get(key)
+        if compiled is None:
+            alternatives = getattr(owner, paths)
+            compiled = cls.compiled.setdefault(
+                key, etree.XPath('|'.join(alternatives[ix] for ix in indices), smart_strings=False))
+        return compiled
+    @staticmethod
+    def anchorable(owner, paths: str) -> bool:
+        """
+        Whether an object's relative paths select the same nodes when evaluated from the page root.
+        This holds for paths starting with a descendant step without positional predicate, e.g.
+        'descendant::h2/a[1]/@href' but not 'descendant::a[1]/@href' or 'span/@data-bs-content'.
+        Args:
+            owner: The Field instance holding the paths.
+            paths (str): The name of the attribute holding the paths.
+        Returns:
+            bool: Whether every path can be anchored at the page root.
+        """
+        for path in getattr(owner, paths):
+            if not path.startswith('descendant::'):
+                return False
+            depth, first_step = 0, path
+            for ix, char in enumerate(path):
+                depth += (char == '[') - (char == ']')
+                if char == '/' and depth == 0:
+                    first_step = path[:ix]
+                    break
+            if POSITIONAL.search(first_step):
+                return False
+        return True
+    @classmethod
+    def anchored(cls, owner, paths: str) -> etree.XPath:
+        """
+        Returns the compiled union of an object's paths, compiling it on first use. Text and attribute
+        results are smart strings, so the node they come from is known.
+        Args:
+            owner: The Field instance holding the paths.
+            paths (str): The name of the attribute holding the paths.
+        Returns:
+            etree.XPath: The compiled XPath union.
+        """
+        key = (owner.__class__, paths, 'anchored')
+        compiled = cls.compiled.get(key)
+        if compiled is None:
+            compiled = cls.compiled.setdefault(key, etree.XPath('|'.join(getattr(owner, paths))))
+        return compiled
+    @staticmethod
+    def first(alternatives, root, total: int = None) -> tuple:
+        """
+        Evaluates compiled alternatives in order up to the first non-empty result.
+        Args:
+            alternatives: The compiled XPath expressions.
+            root: The lxml element to evaluate them on.
+            total (int, optional): The number of configured alternatives, when only some of them are
+                evaluated. Defaults to the number of alternatives.
+        Returns:
+            tuple: The raw XPath results, empty if nothing matched, and the number of configured
+                alternatives skipped.
+        """
+        total = len(alternatives) if total is None else total
+        for ix, alternative in enumerate(alternatives):
+            out = alternative(root)
+            if out:
+                return out, total - ix - 1
+        return [], total - len(alternatives)
+    @classmethod
+    def tagged(cls, fieldclasses: tuple, paths: str) -> tuple:
+        """
+        Returns one compiled expression evaluating the paths of several fields, compiling it on first use.
+        The union of each field, or each alternative of a first_match field, is wrapped in a falcon:tag()
+        call recording its matches under the index of its operand.
+        Args:
+            fieldclasses (tuple): The Field classes to evaluate.
+            paths (str): The name of the attribute holding the paths, e.g. 'relative_xpaths'.
+        Returns:
+            tuple: The compiled expression and the number of operands of each field, None for a union.
+        """
+        key = (fieldclasses, tuple(field.first_match for field in fieldclasses), paths, 'tagged')
+        compiled = cls.compiled.get(key)
+        if compiled is None:
+            operands, groups = [], []
+            for fieldclass in fieldclasses:
+                alternatives = getattr(fieldclass(None), paths)
+                if fieldclass.first_match:
+                    operands += alternatives
+                    groups.append(len(alternatives))
+                else:
+                    operands.append('|'.join(alternatives))
+                    groups.append(None)
+            # falcon:tag() returns false, so every operand of the 'or' chain is evaluated.
+            expression = etree.XPath(
+                ' or '.join(f'falcon:tag({ix}, {operand})' for ix, operand in enumerate(operands)),
+                namespaces={'falcon': cls.namespace}, extensions={(cls.namespace, 'tag'): cls._tag},
+                smart_strings=False)
+            compiled = cls.compiled.setdefault(key, (expression, tuple(groups)))
+        return compiled
+    @classmethod
+    def split(cls, fieldclasses, paths: str, root) -> list[tuple]:
+        """
+        Evaluates several fields with one tagged expression and splits the matches per field. The
+        alternatives of first_match fields are all evaluated and the first non-empty one is kept.
+        Args:
+            fieldclasses: The Field classes to evaluate.
+            paths (str): The name of the attribute holding the paths, e.g. 'relative_xpaths'.
+            root: The lxml element to evaluate them on.
+        Returns:
+            list: The raw XPath results of each field and the number of alternatives it skipped, as with first.
+        """
+        expression, groups = cls.tagged(tuple(fieldclasses), paths)
+        cls._local.matches = matches = {}
+        expression(root)
+        results, ix = [], 0
+        for group in groups:
+            if group is None:
+                results.append((matches.get(ix, []), 0))
+                ix += 1
+                continue
+            found = next((jx for jx in range(group) if matches.get(ix + jx)), None)
+            results.append(([], 0) if found is None else (matches[ix + found], group - found - 1))
+            ix += group
+        return results
+    @classmethod
+    def _tag(cls, _context, ix, nodes):
+        cls._local.matches[int(ix)] = nodes
+        return False
@@ -3,10 +3,20 @@ Module containing utility functions for the project.
 Functions:
     dir: Returns the path to a file in the current directory.
     ravel: Flattens and formats a string, list, or set.
+    ravel_many: Flattens and formats a column of values at once.
+    findall_many: Finds the matches of a pattern in a column of strings at once.
+    get_root: Returns the lxml element behind a selector or response.
+    getall: Converts XPath results to strings.
+    owners: Returns the indices of the cards containing an XPath result.
+    conf_hash: Returns the hash of a configuration file's content.
 """
+from bisect import bisect_right
+from functools import lru_cache
 from os import path
+import hashlib
 import re
 from typing import Union
+from lxml import etree
 def flatten_dict(d, parent_key='', sep=':'):
     """
     Flatten a dictionary with nested dictionaries and lists.
@@ -31,6 +41,17 @@ def flatten_dict(d, parent_key='', sep=':'):
         else:
             items.append((new_key, v))
     return dict(items)
+@lru_cache(maxsize=None)
+def conf_hash(file: str) -> str:
+    """
+    Returns the hash of a configuration file's content, read once per process.
+    Args:
+        file (str): The path to the configuration file.
+    Returns:
+        str: The sha256 hex digest of the file.
+    """
+    with open(file, 'rb') as conf_file:
+        return hashlib.sha256(conf_file.read()).hexdigest()
 def current_dir(file: str) -> str:
     """
     Returns the path to a file in the current directory.
@@ -51,6 +72,7 @@ PHONE = r'[\s\-]{0,1}?'.join([
     r'\d{2})'
 ])
 CURRENCY = r'(\d{1}.*?)[^\d\s,.]'
+POSITIONAL = re.compile(r'\[\s*\d+\s*\]|position\(\)|last\(\)')
 def ravel(value: Union[str, list[str], set[str]], sep: str = ' ') -> str:
     """
     Flattens and formats a string, list, or set.
@@ -65,3 +87,100 @@ def ravel(value: Union[str, list[str], set[str]], sep: str = ' ') -> str:
     raveled = value.replace('\n', ' ')
     removed_multiple_spaces = re.sub(r'\s+', ' ', raveled)
     return removed_multiple_spaces.strip()
+def ravel_many(values, sep: str = ' ') -> list[str]:
+    """
+    Flattens and formats a column of values at once, the same way ravel does for each value.
+    The values are joined into one buffer so whitespace is collapsed in a single pass.
+    Args:
+        values: The values to flatten and format.
+        sep (str, optional): The separator to use when joining elements. Defaults to ' '.
+    Returns:
+        list: The flattened and formatted values.
+    """
+    joined = [sep.join(set(value)) if isinstance(value, (set, list)) else value for value in values]
+    if not joined:
+        return []
+    buffer = '\x00'.join(joined)
+    # The values are split back on NUL, which cannot be told apart from a NUL inside a value.
+    if buffer.count('\x00') != len(joined) - 1:
+        return [ravel(value) for value in joined]
+    buffer = re.sub(r'\s+', ' ', buffer.replace('\n', ' '))
+    return [value.strip() for value in buffer.split('\x00')]
+def findall_many(pattern, texts: list[str]) -> list[list]:
+    """
+    Finds the matches of a pattern in a column of single-line strings with one scan.
+    The strings are joined by newlines and the pattern is run in multiline mode, so patterns that
+    cannot cross a newline return the same matches as re.findall on each string.
+    Args:
+        pattern: The pattern, as a string or compiled without flags.
+        texts (list): The strings, none of them containing a newline.
+    Returns:
+        list: The re.findall result of each string.
+    """
+    compiled = re.compile(getattr(pattern, 'pattern', pattern), re.M)
+    starts, offset = [], 0
+    for text in texts:
+        starts.append(offset)
+        offset += len(text) + 1
+    out = [[] for _ in texts]
+    for match in compiled.finditer('\n'.join(texts)):
+        if compiled.groups == 0:
+            found = match.group()
+        elif compiled.groups == 1:
+            found = match.group(1)
+        else:
+            found = match.groups(default='')
+        out[bisect_right(starts, match.start()) - 1].append(found)
+    return out
+def get_root(html):
+    """
+    Returns the lxml element behind a selector or response.
+    Args:
+        html: A scrapy Response, a parsel Selector or an lxml element.
+    Returns:
+        The underlying lxml element.
+    """
+    html = getattr(html, 'selector', html)
+    return getattr(html, 'root', html)
+def getall(results) -> list[str]:
+    """
+    Converts XPath results to strings, the same way parsel's getall does.
+    Args:
+        results: The result of a compiled XPath evaluation.
+    Returns:
+        list: A list of strings.
+    """
+    if not isinstance(results, list):
+        results = [results]
+    out = []
+    for result in results:
+        if isinstance(result, str):
+            out.append(str(result))
+        elif isinstance(result, bool):
+            out.append('1' if result else '0')
+        elif isinstance(result, etree._Element):
+            out.append(etree.tostring(result, method='html', encoding='unicode', with_tail=False))
+        else:
+            out.append(str(result))
+    return out
+def owners(result, index: dict) -> list[int]:
+    """
+    Returns the indices of the cards containing an XPath result.
+    Args:
+        result: An element or a smart string returned by an XPath evaluation.
+        index (dict): The card elements mapped to their index.
+    Returns:
+        list: The indices of every card that is the node of the result or one of its ancestors.
+    """
+    node = result
+    if isinstance(result, str):
+        node = result.getparent()
+        # The tail text of an element belongs to the element's parent.
+        if node is not None and result.is_tail:
+            node = node.getparent()
+    out = []
+    while node is not None:
+        if node in index:
+            out.append(index[node])
+        node = node.getparent()
+    return out
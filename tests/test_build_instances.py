@@ -12,6 +12,8 @@ Functions:
 """
 from falcon import Model
 from falcon import Item
+from falcon.Records import MappedData
+from falcon.XPaths import XPathCache
 from scrapy import Selector
 from dataclasses import dataclass
 
@@ -55,4 +57,52 @@ def test_MainItem_instance():
     """
     html = '''<div></div>'''
     mi = Item.MainItem.parse(Selector(text=html)).dataclass
-    assert mi.__class__.__name__ == 'MainItem'
\ No newline at end of file
+    assert mi.__class__.__name__ == 'MainItem'
+def test_xpath_cache_reused():
+    """
+    Test that the compiled XPath union of a Field class is built once and reused across instances.
+    """
+    html = Selector(text='''<div><h2>title</h2></div>''')
+    Item.MainItem.parse(html)
+    compiled = dict(XPathCache.compiled)
+    Item.MainItem.parse(html)
+    assert all(XPathCache.compiled[key] is value for key, value in compiled.items())
+    assert len(XPathCache.compiled) == len(compiled)
+
+def test_config_plan_frozen():
+    """
+    Test that the configuration plan is parsed once and exposes immutable tuples of xpaths.
+    """
+    from falcon.Css import MainCss
+    product_title = Item.MainItem.registry[0]
+    plan = MainCss.plan()
+    assert plan is MainCss.plan()
+    assert isinstance(plan['ProductTitle']['xpaths'], tuple)
+    assert product_title(None).relative_xpaths is plan['ProductTitle']['relative_xpaths']
+    with pytest.raises(TypeError):
+        plan['ProductTitle']['xpaths'] = ()
+
+def test_MappedData_class_cached():
+    """
+    Test that records sharing a schema share one dataclass type instead of building one per item.
+    """
+    first = MappedData('MainItem', [('Title', 'str', 'a'), ('Price', 'str', '1')])
+    second = MappedData('MainItem', [('Title', 'str', 'b'), ('Price', 'str', '2')])
+    assert type(first.dataclass) is type(second.dataclass)
+    assert second.to_dict() == {'Title': 'b', 'Price': '2'}
+
+def test_MappedData_serialization():
+    """
+    Test that a record is serialized once and that its flat mapping and JSON encoding agree with to_dict.
+    """
+    import json
+    record = MappedData('MainItem', [('Title', 'str', 'Thiéboudienne'), ('Price', 'str', '1500')])
+    assert record.to_flat() is record.to_flat()
+    assert record.to_flat() == record.to_dict()
+    assert record.to_json() is record.to_json()
+    assert json.loads(record.to_json()) == record.to_dict()
+    with pytest.raises(TypeError):
+        record.to_flat()['Price'] = '0'
+    copy = dict(record.to_flat())
+    copy['Price'] = '0'
+    assert record.to_flat()['Price'] == '1500' and json.loads(record.to_json())['Price'] == '1500'
@@ -0,0 +1,52 @@
+"""
+Module Test Dates
+
+This module contains test functions for the fast-path publish date parser.
+
+Functions:
+- test_fast_path_matches_dateparser(): Checks that recognized dates are the ones dateparser returns.
+- test_fallback_counted(): Checks that values no pattern resolves go to dateparser and are counted.
+- test_threaded_stats(): Checks that the values parsed by several threads are all counted.
+"""
+from datetime import datetime, timedelta
+import threading
+import dateparser
+import pytest
+from falcon.Dates import DateParser
+
+@pytest.mark.parametrize('value', [
+    'Hier, 10:49', "Aujourd'hui 14:05", "Aujourd’hui à 14h05", '12 mars 2024', '12 mars 2024 à 14h05',
+    '2024-03-12T10:00:00Z', '2024-03-12 10:00:00', 'March 12, 2024', '3 janv. 2024', 'il y a 3 heures',
+    '5 minutes ago'])
+def test_fast_path_matches_dateparser(value):
+    """
+    This test function checks that the dates resolved by the precompiled patterns are the ones dateparser returns.
+    """
+    date = DateParser().recognize(value)
+    expected = dateparser.parse(value, languages=['fr', 'en'])
+    assert abs(date - expected) < timedelta(seconds=5)
+
+def test_fallback_counted():
+    """
+    This test function checks that values no pattern resolves are parsed by dateparser and counted as such.
+    """
+    parser = DateParser()
+    assert parser.parse('il y a 2 mois') < datetime.now()
+    assert parser.parse('Hier, 10:49').time().isoformat() == '10:49:00'
+    assert parser.stats == {'fallback': 1, 'day': 1}
+    assert parser.hit_rate == 0.5
+
+def test_threaded_stats():
+    """
+    This test function checks that the values parsed by several threads are all counted.
+    """
+    parser = DateParser()
+    def parse():
+        for _ in range(500):
+            parser.recognize('Hier, 10:49')
+    threads = [threading.Thread(target=parse) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert parser.stats == {'day': 2000}
@@ -11,8 +11,14 @@ Functions:
 - test_field_PublishLink(): Checks 'Publish Link' field of the item.
 - test_field_ProductPrice(): Checks 'Product Price' field of the item.
 - test_field_VendorLocation(): Checks 'Vendor Location' field of the item.
+- test_typed_price(): Checks the integer amount and currency code of the typed price fields.
+- test_first_match_skipped_stats(): Checks that skipped alternatives are counted in the counter of the parse.
+- test_single_pass(): Checks that single-pass extraction gives the values of the per-field path.
 """
+from collections import Counter
+import pytest
 from falcon.Item import MainItem
+from falcon.Profile import SiteProfile
 from scrapy import Selector
 
 html = """          <div class="listings-cards__list-item">
@@ -149,4 +155,131 @@ def test_field_VendorLocation():
     """
     field = item.VendorLocation 
     expected = 'Liberte 6 extension, Dakar'
-    assert field == expected
\ No newline at end of file
+    assert field == expected
+
+def test_first_match_VendorLocation(monkeypatch):
+    """
+    This test function checks that first_match stops at the first matching alternative and reports the skipped ones.
+    """
+    vendor_location = next(field for field in MainItem.registry if field.__name__ == 'VendorLocation')
+    monkeypatch.setattr(vendor_location, 'first_match', True)
+    field = vendor_location(Selector(text=html))
+    assert field.value == 'Liberte 6 extension, Dakar'
+    assert field.skipped == len(field.xpaths) - 8
+
+def test_first_match_skipped_stats(monkeypatch, tmp_path):
+    """
+    This test function checks that skipped alternatives are counted in the counter given to the parse, on
+    the plain, profiled and compiled paths alike.
+    """
+    vendor_location = next(field for field in MainItem.registry if field.__name__ == 'VendorLocation')
+    monkeypatch.setattr(vendor_location, 'first_match', True)
+    monkeypatch.setattr(MainItem, 'compile_dir', str(tmp_path))
+    field = vendor_location(Selector(text=html))
+    assert field.relative_value and field.skipped
+    skipped = field.skipped
+    stats = Counter()
+    MainItem.parse(Selector(text=html), method='relative_value', skipped_stats=stats)
+    assert stats == Counter({'VendorLocation': skipped})
+    profile = SiteProfile('skipped', directory=str(tmp_path))
+    MainItem.parse(Selector(text=html), method='relative_value', profile=profile, skipped_stats=stats)
+    assert stats == Counter({'VendorLocation': 2 * skipped})
+    MainItem.compile(skipped_stats=stats)(Selector(text=html).root)
+    assert stats == Counter({'VendorLocation': 3 * skipped})
+    MainItem.parse(Selector(text=html), method='relative_value')
+    assert stats == Counter({'VendorLocation': 3 * skipped})
+
+
+def test_single_pass(monkeypatch):
+    """
+    This test function checks that single-pass extraction gives the values and skipped counts of the per-field
+    path, with first_match fields among the fields.
+    """
+    def parse(**kwargs):
+        stats = Counter()
+        record = MainItem.parse(Selector(text=html), method='relative_value', skipped_stats=stats, **kwargs).to_dict()
+        record.pop('CreatedAt')
+        return record, stats
+    assert parse(single_pass=True) == parse()
+    for name in ('VendorLocation', 'ProductPrice'):
+        monkeypatch.setattr(next(field for field in MainItem.registry if field.__name__ == name), 'first_match', True)
+    single, stats = parse(single_pass=True)
+    assert (single, stats) == parse() and stats['VendorLocation']
+    assert single['ProductPrice'] == '100000'
+    with pytest.raises(ValueError):
+        MainItem.parse(Selector(text=html), single_pass=True, lazy=True)
+
+def test_fields_projection():
+    """
+    This test function checks that only the requested fields are parsed and kept in the record schema.
+    """
+    projected = MainItem.parse(Selector(text=html), fields=['PublishLink', 'ProductPrice']).to_dict()
+    assert list(projected) == ['PublishLink', 'ProductPrice', 'CreatedAt']
+    assert projected['PublishLink'] == item.PublishLink
+
+
+def test_lazy_record():
+    """
+    This test function checks that a lazy record only evaluates the fields it is asked for until it is materialized.
+    """
+    lazy = MainItem.parse(Selector(text=html), lazy=True)
+    assert lazy.PublishLink == item.PublishLink
+    assert set(lazy._values) == {'PublishLink', 'CreatedAt'}
+    assert lazy.to_dict()['VendorLocation'] == item.VendorLocation
+    assert lazy.dataclass.__class__.__name__ == 'MainItem'
+
+
+def test_compiled_extractor(tmp_path, monkeypatch):
+    """
+    This test function checks that the compiled extraction function returns the fields of MainItem.parse and is cached on disk.
+    """
+    monkeypatch.setattr(MainItem, 'compile_dir', str(tmp_path))
+    monkeypatch.setattr(MainItem, '_extractors', {})
+    extract = MainItem.compile()
+    compiled = dict(zip(extract.fields, extract(Selector(text=html).root)))
+    compiled.pop('CreatedAt')
+    expected = MainItem.parse(Selector(text=html)).to_dict()
+    expected.pop('CreatedAt')
+    assert compiled == expected
+    assert len(list(tmp_path.iterdir())) == 1
+    # Warm starts load the marshalled code object without generating nor compiling any source.
+    monkeypatch.setattr(MainItem, '_extractors', {})
+    monkeypatch.setattr('falcon.Compiler.compile', None, raising=False)
+    assert MainItem.compile()(Selector(text=html).root)[:-1] == extract(Selector(text=html).root)[:-1]
+    monkeypatch.undo()
+    monkeypatch.setattr(MainItem, 'compile_dir', str(tmp_path))
+    monkeypatch.setattr(MainItem, '_extractors', {})
+    next(tmp_path.iterdir()).write_bytes(b'corrupt')
+    assert MainItem.compile()(Selector(text=html).root)[:-1] == extract(Selector(text=html).root)[:-1]
+
+
+def test_format_cache(monkeypatch):
+    """
+    This test function checks that an opt-in format cache serves repeated raw values and keeps the parsed fields unchanged.
+    """
+    from falcon.Cache import FormatCache
+    from falcon.Model import Formatter
+    cache = FormatCache(maxsize=8)
+    monkeypatch.setattr(Formatter, 'cache', cache)
+    first = MainItem.parse(Selector(text=html)).dataclass
+    second = MainItem.parse(Selector(text=html)).dataclass
+    assert (first.ProductTitle, first.PublishDate) == (second.ProductTitle, second.PublishDate) == (item.ProductTitle, item.PublishDate)
+    assert cache.stats['hits'] == 6
+    assert cache.stats['size'] == 6
+    cache.maxsize = 4
+    MainItem.parse(Selector(text=html.replace('Dakar', 'Thies')))
+    assert cache.stats['size'] == 4
+
+
+def test_typed_price():
+    """
+    This test function checks that the typed price fields are only parsed when selected and hold an int amount and a currency code.
+    """
+    assert 'ProductAmount' not in MainItem.parse(Selector(text=html)).to_dict()
+    typed = MainItem.parse(Selector(text=html), fields=['ProductPrice', 'ProductAmount', 'ProductCurrency'])
+    assert typed.dataclass.ProductAmount == int(item.ProductPrice.split(';')[0])
+    assert typed.dataclass.ProductCurrency == 'XOF'
+    fields = {field.__name__: field(None) for field in MainItem.registry}
+    assert fields['ProductAmount'].format(['1 250,00 € TTC']) == 125000
+    assert fields['ProductAmount'].format([]) is None
+    assert [fields['ProductCurrency'].format(value) for value in [['12 €'], ['$ 40'], ['Prix : 2 500 000 F'], []]] == ['EUR', 'USD', 'XOF', '']
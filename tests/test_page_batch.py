@@ -0,0 +1,93 @@
+"""
+Module Test Page Batch
+
+This module contains test functions for the columnar batch extraction of pages.
+
+Functions:
+- test_extract_batch_matches_items(): Checks that the columns hold the values of the items, in card order.
+- test_extract_batch_first_match(): Checks that first_match and profiled fields give the values of the items.
+- test_extract_batch_anchorable(): Checks which relative paths can be evaluated from the page root.
+- test_format_many(): Checks that formatting a column gives the values of formatting each value.
+- test_default_as_batch(): Checks that the card by card columns of Page match the page-wide columns.
+"""
+from falcon.Page import MainPage
+from falcon.Item import MainItem
+from falcon.Model import Page
+from falcon.Profile import SiteProfile
+from falcon.XPaths import XPathCache
+from scrapy import Selector
+from test_item_fields import html
+
+def test_extract_batch_matches_items():
+    """
+    This test function checks that the columns of extract_batch hold the values of the page items, in card order.
+    """
+    other = html.replace("Centre d'Appels", 'Vendeur').replace('100 000', '25 000')
+    page = MainPage(Selector(text=f'<html><body>{html}{other}{html}</body></html>'))
+    columns = page.extract_batch()
+    items = [item.to_dict() for item in page]
+    assert list(columns) == list(items[0])
+    for name, column in columns.items():
+        if name != 'CreatedAt':
+            assert column == [item[name] for item in items]
+    assert columns['ProductTitle'] == ["Centre d'Appels", 'Vendeur', "Centre d'Appels"]
+
+def test_extract_batch_first_match(monkeypatch, tmp_path):
+    """
+    This test function checks that first_match fields and the fields of a profiled page give the values of the
+    items, card by card, and count the same skipped alternatives.
+    """
+    monkeypatch.setattr(next(field for field in MainItem.registry if field.__name__ == 'ProductPrice'), 'first_match', True)
+    other = html.replace("Centre d'Appels", 'Vendeur').replace('100 000', '25 000')
+    body = f'<html><body>{html}{other}</body></html>'
+    for profile in (None, SiteProfile('batch', directory=str(tmp_path))):
+        page = MainPage(Selector(text=body), profile=profile)
+        columns = page.extract_batch()
+        batch_skipped = +page.skipped_stats
+        page.skipped_stats.clear()
+        items = [item.to_dict() for item in page]
+        for name, column in columns.items():
+            if name != 'CreatedAt':
+                assert column == [item[name] for item in items]
+        assert columns['ProductPrice'] == ['100000', '25000']
+        assert batch_skipped == page.skipped_stats
+
+def test_extract_batch_anchorable():
+    """
+    This test function checks that paths with a positional first step are not anchored at the page root.
+    """
+    anchorable = {field.__name__: XPathCache.anchorable(field(None), 'relative_xpaths') for field in MainItem.registry}
+    assert anchorable['Contact']
+    assert not anchorable['PublishLink']
+
+def test_format_many():
+    """
+    This test function checks that format_many gives the same values as format, value by value, including
+    for subclasses overriding fmethod or format.
+    """
+    values = [
+        ['  100 000 FCFA\n', '12'], ['Tel: +221 77 123 45 67', '78-123-45-67 ou 33 800 12 34'],
+        [], ['\n'], ['a\x00b'], 'Dakar\n  Plateau', ['2 500 000 F', '45,000 CFA']]
+    for field in MainItem.registry:
+        formatter = field(None)
+        assert formatter.format_many(values) == [formatter.format(value) for value in values]
+    assert MainItem.registry[0](None).format_many([]) == []
+    for field in MainItem.registry:
+        overrides = [
+            {'fmethod': lambda self, value, fmethod=field.fmethod: f'<{fmethod(self, value)}>'},
+            {'format': lambda self, value, format=field.format: f'[{format(self, value)}]'}]
+        for override in overrides:
+            formatter = type(f'Custom{field.__name__}', (field,), override)(None)
+            assert formatter.format_many(values) == [formatter.format(value) for value in values]
+
+def test_default_as_batch():
+    """
+    This test function checks that the card by card columns of the Page base class match the page-wide columns.
+    """
+    other = html.replace("Centre d'Appels", 'Vendeur')
+    page = MainPage(Selector(text=f'<html><body>{html}{other}</body></html>'))
+    columns, default = page.extract_batch(), Page.as_batch(page, page.page_items)
+    assert list(default) == list(columns)
+    assert {name: column for name, column in default.items() if name != 'CreatedAt'} == {
+        name: column for name, column in columns.items() if name != 'CreatedAt'}
+    assert Page.as_batch(page, []) == {}
@@ -0,0 +1,89 @@
+"""
+Module Test Pagination
+
+This module contains test functions for the prediction of the pages of a listing.
+
+Functions:
+- test_page_pattern(): Checks the detection of numbered page URLs.
+- test_paginator_window(): Checks that a numbered series is requested a window ahead and closed by an empty or repeated page.
+- test_unknown_signature(): Checks that pages without links or values extend a series rather than close it.
+- test_paginator_next_link(): Checks that next links are followed one by one without a window or a numbered link.
+- test_spider_yields_requests(): Checks that the spider yields the requests of the following pages.
+"""
+from falcon.Pagination import PagePattern, Paginator
+from falcon.Records import MappedData
+from falcon.Site import MainSite
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from test_item_fields import html
+
+def test_page_pattern():
+    """
+    This test function checks the detection of page numbers in query parameters and paths.
+    """
+    pattern = PagePattern.detect('https://www.expat-dakar.com/voitures?sort=new&page=3')
+    assert pattern.number == 3
+    assert pattern.url(4) == 'https://www.expat-dakar.com/voitures?sort=new&page=4'
+    pattern = PagePattern.detect('https://site.sn/annonces/page/12/?q={x}')
+    assert (pattern.number, pattern.url(13)) == (12, 'https://site.sn/annonces/page/13/?q={x}')
+    assert PagePattern.detect('https://site.sn/voitures?pages=3') is None
+    assert PagePattern.detect('https://site.sn/voitures/3') is None
+
+def test_paginator_window():
+    """
+    This test function checks that a numbered series is requested a window ahead of the pages parsed,
+    and that an empty or repeated page closes it.
+    """
+    url = 'https://site.sn/voitures?page={}'
+    paginator = Paginator(window=3)
+    assert paginator.follow('https://site.sn/voitures', url.format(2), frozenset('a')) == [url.format(n) for n in (2, 3, 4)]
+    assert paginator.follow(url.format(3), url.format(4), frozenset('c')) == [url.format(5), url.format(6)]
+    assert paginator.follow(url.format(2), url.format(3), frozenset('b')) == []
+    assert paginator.follow(url.format(4), url.format(5), frozenset('d')) == [url.format(7)]
+    assert paginator.follow(url.format(6), url.format(7), frozenset('d')) == []
+    assert paginator.follow(url.format(5), url.format(6), frozenset('e')) == []
+    paginator = Paginator(window=3)
+    paginator.follow('https://site.sn/voitures', url.format(2), frozenset('a'))
+    assert paginator.follow(url.format(3), None, frozenset()) == []
+    assert paginator.follow(url.format(2), url.format(3), frozenset('b')) == []
+
+def test_unknown_signature():
+    """
+    This test function checks that empty links are left out of signatures, and that pages whose records
+    have no link nor value extend a series rather than close it as repeated.
+    """
+    def record(link, title=''):
+        return MappedData('Listing', [('PublishLink', str, link), ('ProductTitle', str, title)])
+    assert Paginator.signature([record(''), record('https://site.sn/a1')]) == frozenset({'https://site.sn/a1'})
+    assert Paginator.signature([record('', 'Vendeur')]) == frozenset({('', 'Vendeur')})
+    assert Paginator.signature([record(''), record('')]) is None
+    assert Paginator.signature([]) == frozenset()
+    url = 'https://site.sn/voitures?page={}'
+    paginator = Paginator(window=2)
+    assert paginator.follow('https://site.sn/voitures', url.format(2), None) == [url.format(2), url.format(3)]
+    assert paginator.follow(url.format(2), url.format(3), None) == [url.format(4)]
+    assert paginator.follow(url.format(3), url.format(4), None) == [url.format(5)]
+    assert paginator.follow(url.format(4), None, frozenset()) == []
+
+def test_paginator_next_link():
+    """
+    This test function checks that next links are followed one by one without a window or a numbered link.
+    """
+    assert Paginator(window=0).follow('https://site.sn/a', 'https://site.sn/a?page=2', frozenset('a')) == [
+        'https://site.sn/a?page=2']
+    assert Paginator(window=3).follow('https://site.sn/a', 'https://site.sn/a?after=xyz', frozenset('a')) == [
+        'https://site.sn/a?after=xyz']
+    assert Paginator(window=3).follow('https://site.sn/a', None, frozenset('a')) == []
+
+def test_spider_yields_requests():
+    """
+    This test function checks that the spider yields the requests of the following pages, with a window or not.
+    """
+    body = f'<html><body>{html}<a class="next" href="/voitures?page=2">Suivant</a></body></html>'
+    response = HtmlResponse(url='https://site.sn/voitures', body=body, encoding='utf-8')
+    for window, pages in [(0, [2]), (3, [2, 3, 4])]:
+        spider = MainSite('site', [response.url], window=window).spider()
+        requests = [output for output in spider.parse(response) if isinstance(output, Request)]
+        assert [request.url for request in requests] == [f'https://site.sn/voitures?page={n}' for n in pages]
+    assert not [output for output in MainSite('site', [response.url], follow=False).spider().parse(response)
+                if isinstance(output, Request)]
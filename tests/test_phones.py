@@ -0,0 +1,45 @@
+"""
+Module Test Phones
+
+This module contains test functions for the Senegalese phone number scanner.
+
+Functions:
+- test_numbers(): Checks the national numbers read from contact hrefs.
+- test_numbers_many(): Checks that scanning a column gives the numbers of each value.
+- test_encode(): Checks the integer encoding of national numbers.
+"""
+import pytest
+from falcon.Phones import decode, encode, numbers, numbers_many
+
+@pytest.mark.parametrize('value,expected', [
+    ('tel:+221 77 123 45 67', ['771234567']),
+    ('tel:00221-77-123-45-67', ['771234567']),
+    ('whatsapp:phone=221787320433?message=...', ['787320433']),
+    ('tel:221%2033%20800%2012%2034', ['338001234']),
+    ('77 123 45 67 / 78.123.45.67', ['771234567', '781234567']),
+    ('2024 - 77 123 45 67', ['771234567']),
+    (['tel:771234567', 'sms:+221771234567'], ['771234567']),
+    ('whatsapp:phone=221007320433', []),
+    ('0771234567 ' + '1' * 5000, []),
+])
+def test_numbers(value, expected):
+    """
+    This test function checks the national numbers read from contact hrefs, in order and without duplicates.
+    """
+    assert numbers(value) == expected
+
+def test_numbers_many():
+    """
+    This test function checks that scanning a column at once gives the numbers of each value.
+    """
+    values = [['tel:221787320433', 'whatsapp:phone=221007320433?m'], 'no number', [], 'a\n77 123 45 67', ['77', '1234567']]
+    assert numbers_many(values) == [numbers(value) for value in values]
+
+def test_encode():
+    """
+    This test function checks that national numbers are encoded to their E.164 integer and back.
+    """
+    assert encode('771234567') == 221771234567
+    assert decode(encode('338001234')) == '338001234'
+    with pytest.raises(ValueError):
+        encode('071234567')
@@ -0,0 +1,68 @@
+"""
+Module Test Profile
+
+This module contains test functions for the adaptive per-site selector profiles.
+
+Functions:
+- test_profile_prunes_after_warmup(): Checks that a profile keeps only the alternatives that matched.
+- test_profile_output_unchanged(): Checks that pages parsed through a profile yield the same items.
+- test_profile_persisted(): Checks that a profile is reloaded from its file.
+- test_profile_fallback(): Checks that a pruned key falls back to every alternative when it stops matching.
+"""
+from falcon.Page import MainPage
+from falcon.Profile import SiteProfile
+from scrapy import Selector
+from test_item_fields import html
+
+page = Selector(text=f'<html><body>{html * 3}</body></html>')
+
+def items(profile=None):
+    """
+    Parses the test page and returns its items without their creation date.
+    """
+    out = []
+    for item in MainPage(page, profile=profile):
+        data = item.to_dict()
+        data.pop('CreatedAt')
+        out.append(data)
+    return out
+
+def test_profile_prunes_after_warmup(tmp_path):
+    """
+    This test function checks that a profile keeps only the alternatives that matched during warm-up.
+    """
+    profile = SiteProfile('site', warmup=2, directory=str(tmp_path))
+    for _ in range(3):
+        items(profile)
+    assert profile.kept['ProductTitle:relative_xpaths'] == (17,)
+    assert 'MainPage:next_xpaths' not in profile.kept
+
+def test_profile_output_unchanged(tmp_path):
+    """
+    This test function checks that pages parsed through a profile yield the same items as without it.
+    """
+    profile = SiteProfile('site', warmup=1, directory=str(tmp_path))
+    expected = items()
+    assert all(items(profile) == expected for _ in range(3))
+
+def test_profile_persisted(tmp_path):
+    """
+    This test function checks that a profile is reloaded from its file by site name.
+    """
+    profile = SiteProfile('site', warmup=1, directory=str(tmp_path))
+    for _ in range(2):
+        items(profile)
+    reloaded = SiteProfile('site', directory=str(tmp_path))
+    items(reloaded)
+    assert reloaded.kept == profile.kept
+
+def test_profile_fallback(tmp_path):
+    """
+    This test function checks that a pruned key falls back to every alternative when its hit rate drops.
+    """
+    profile = SiteProfile('site', warmup=1, window=2, directory=str(tmp_path))
+    for _ in range(2):
+        items(profile)
+    profile.kept['ProductTitle:relative_xpaths'] = (0,)
+    assert items(profile) == items()
+    assert 'ProductTitle:relative_xpaths' not in profile.kept
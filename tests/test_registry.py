@@ -0,0 +1,79 @@
+"""
+Module Test Registry
+
+This module contains test functions for the registries of site definitions.
+
+Functions:
+- test_registry_sources(): Checks that JSONL and CSV files give the same definitions.
+- test_registry_select_partition(): Checks the restriction of a registry to names, domains and partitions.
+- test_independent_iterations(): Checks that iterations over the same sites do not share state.
+- test_csv_columns(): Checks that CSV cells are read as the types of the MainSite arguments.
+"""
+import json
+import pytest
+from falcon.Registry import SiteRegistry, domain
+from falcon.Site import MultipleSites
+
+definitions = [
+    (f'site{ix}', {'start_urls': [f'https://{host}/categorie-{ix}'], 'follow': ix % 2 == 0})
+    for ix, host in enumerate(['www.expat-dakar.com', 'coinafrique.com', 'www.expat-dakar.com', 'jumia.sn'] * 5)]
+
+def write_sources(tmp_path):
+    jsonl, csv = tmp_path / 'sites.jsonl', tmp_path / 'sites.csv'
+    jsonl.write_text('\n'.join(json.dumps({'name': name, **kwargs}) for name, kwargs in definitions) + '\n')
+    csv.write_text('name,start_urls,follow\n' + ''.join(
+        f"{name},{' '.join(kwargs['start_urls'])},{kwargs['follow']}\n" for name, kwargs in definitions))
+    return str(jsonl), str(csv)
+
+def test_registry_sources(tmp_path):
+    """
+    This test function checks that JSONL and CSV files give the definitions they were written from.
+    """
+    for source in write_sources(tmp_path):
+        registry = SiteRegistry(source)
+        assert list(registry) == definitions
+        assert len(registry) == 20
+        assert registry[3] == definitions[3]
+    assert domain(definitions[0][1]) == 'expat-dakar.com'
+
+def test_registry_select_partition(tmp_path):
+    """
+    This test function checks that registries are restricted to names, domains and disjoint partitions covering every site.
+    """
+    registry = SiteRegistry(write_sources(tmp_path)[0])
+    assert [name for name, _ in registry.select(domains=['jumia.sn'])] == [f'site{ix}' for ix in range(3, 20, 4)]
+    assert len(registry.select(domains=['jumia.sn']).select(names=['site3', 'site0'])) == 1
+    partitions = [[name for name, _ in registry.partition(ix, 3, key='name')] for ix in range(3)]
+    assert sorted(sum(partitions, [])) == sorted(name for name, _ in definitions)
+    by_domain = [{domain(kwargs) for _, kwargs in registry.partition(ix, 2)} for ix in range(2)]
+    assert not by_domain[0] & by_domain[1]
+
+def test_independent_iterations(tmp_path):
+    """
+    This test function checks that nested iterations and several instances over the same file do not interfere.
+    """
+    source = write_sources(tmp_path)[0]
+    sites, other = MultipleSites(source), MultipleSites(source)
+    pairs = [(site.name, inner.name) for site in sites for inner in other]
+    assert len(pairs) == 400
+    assert [site.name for site in sites] == [name for name, _ in definitions]
+    assert MultipleSites(definitions)[5].follow is False
+
+def test_csv_columns(tmp_path):
+    """
+    This test function checks that CSV cells are read as the types of the MainSite arguments, that empty cells
+    take their default and that unknown columns are rejected.
+    """
+    source = tmp_path / 'sites.csv'
+    source.write_text(
+        'name,start_urls,fields,follow,window,max_in_flight,watermark\n'
+        'site0,https://jumia.sn/a,PublishLink ProductPrice,yes,3,8,false\n'
+        'site1,https://jumia.sn/b,,,,,\n')
+    site0, site1 = MultipleSites(str(source))
+    assert (site0.window, site0.max_in_flight, site0.follow) == (3, 8, True)
+    assert site0.fields == ['PublishLink', 'ProductPrice'] and site0.watermark is False
+    assert (site1.window, site1.max_in_flight, site1.follow, site1.fields) == (0, None, True, None)
+    assert site0.spider.max_in_flight == 8
+    source.write_text('name,start_urls,db\nsite0,https://jumia.sn/a,redis://localhost\n')
+    with pytest.raises(ValueError):
+        list(SiteRegistry(str(source)))
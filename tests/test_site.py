@@ -1,8 +1,17 @@
-from falcon.Site import MainSite,MultipleSites
+from falcon.Site import MainSite,MultipleSites,merge_stats,shard,site_spec
+from falcon.Con import Redis, RedisUser
+from falcon.Profile import SiteProfile
+from falcon.Watermark import Watermark
+import json
+import multiprocessing
+import pickle
+import pytest
+from datetime import datetime
 from os import path
 from scrapy import Selector
 from scrapy import Spider
 from scrapy.crawler import CrawlerProcess
+from test_item_fields import html
 
 def page_dir(name):
     extension = 'html'
@@ -23,6 +32,71 @@ def test_MainSite_spider_attr():
     ms = MainSite('p1',start_urls,follow=False)
     spider = ms.spider
     assert issubclass(spider,Spider)
+def test_MainSite_fields_attr():
+    start_urls = [page_dir('p1')]
+    ms = MainSite('p1',start_urls,follow=False,fields=['PublishLink','ProductPrice'])
+    assert ms.spider.fields == ['PublishLink','ProductPrice']
+def test_MainSite_pool_attr():
+    start_urls = [page_dir('p1')]
+    ms = MultipleSites([('p1',{'start_urls':start_urls,'follow':False})],parse_workers=1)
+    spider = ms[0].spider
+    assert spider.pool is ms.pool
+    assert spider.max_in_flight == 2
+    assert MainSite('p1',start_urls,pool=ms.pool,max_in_flight=8).spider.max_in_flight == 8
+    ms.pool.close()
+def test_MainSite_cursor_fields():
+    db = RedisUser('domain1','category1',host='localhost')
+    with pytest.raises(ValueError):
+        MainSite('p1',[page_dir('p1')],db=db,fields=['PublishLink','ProductPrice'])
+    assert MainSite('p1',[page_dir('p1')],db=db,fields=['Contact','ProductTitle']).Db is db
+    assert MainSite('p1',[page_dir('p1')],db=db).Db is db
+def test_shard_balanced():
+    weights = [40, 10, 30, 20, 25, 5]
+    shards = shard(weights,3)
+    assert sorted(ix for indices in shards for ix in indices) == list(range(6))
+    assert sorted(sum(weights[ix] for ix in indices) for indices in shards) == [40, 45, 45]
+    assert shard([1],4) == [[0]]
+def test_merge_stats():
+    merged = merge_stats([
+        {'item_scraped_count':3,'start_time':datetime(2024,1,1,10),'finish_reason':'finished'},
+        {'item_scraped_count':4,'start_time':datetime(2024,1,1,9),'finish_time':datetime(2024,1,1,11)}])
+    assert merged == {'item_scraped_count':7,'start_time':datetime(2024,1,1,9),'finish_reason':'finished','finish_time':datetime(2024,1,1,11)}
+    merged = merge_stats([
+        {'memusage/max':300,'memusage/startup':100,'start_time':datetime(2024,1,1,10),
+         'finish_time':datetime(2024,1,1,10,30),'elapsed_time_seconds':1800.0},
+        {'memusage/max':200,'memusage/startup':120,'start_time':datetime(2024,1,1,9),
+         'finish_time':datetime(2024,1,1,11),'elapsed_time_seconds':7200.0}])
+    assert merged['memusage/max'] == 300 and merged['memusage/startup'] == 120
+    assert merged['elapsed_time_seconds'] == 7200.0
+def test_site_spec(tmp_path):
+    definition = ('p1',{'start_urls':[page_dir('p1')],
+                        'db':(Redis,{'domain':'domain1','category':'category1','host':'localhost'}),
+                        'profile':SiteProfile('p1',warmup=5,directory=str(tmp_path)),
+                        'watermark':Watermark('p1',keep=10,directory=str(tmp_path))})
+    name, kwargs = pickle.loads(pickle.dumps(site_spec(*definition)))
+    site = MainSite(name,**kwargs)
+    assert site.Db.domain == 'domain1'
+    assert site.profile.warmup == 5 and site.profile.file == str(tmp_path/'p1.json')
+    assert site.watermark.keep == 10 and site.watermark.file == str(tmp_path/'p1.json')
+    with pytest.raises(TypeError):
+        site_spec('p1',{'start_urls':[page_dir('p1')],'db':site.Db})
+def test_run_processes(tmp_path):
+    sites = []
+    for i in range(3):
+        page = tmp_path/f'p{i}.html'
+        page.write_text(f'<html><body>{html * (i + 1)}</body></html>')
+        sites.append((f'p{i}',{'start_urls':[page.as_uri()],'follow':False}))
+    history = tmp_path/'history.json'
+    result = MultipleSites(sites).run(workers=2,history=str(history),settings={'LOG_LEVEL':'ERROR'})
+    assert {name: stats['item_scraped_count'] for name, stats in result['sites'].items()} == {'p0':1,'p1':2,'p2':3}
+    assert result['total']['item_scraped_count'] == 6
+    assert result['total']['start_time'] == min(stats['start_time'] for stats in result['sites'].values())
+    assert json.loads(history.read_text()) == {'p0':1,'p1':1,'p2':1}
+def test_run_failed_process(tmp_path):
+    ms = MultipleSites([(f'p{i}',{'start_urls':[page_dir(f'p{i}')],'unknown':True}) for i in range(2)])
+    with pytest.raises(RuntimeError):
+        ms.run(workers=2,history=str(tmp_path/'history.json'))
+    assert multiprocessing.active_children() == []
 def test_Run_Spider():
     start_urls = [page_dir('p1')]
     ms = MainSite('p1',start_urls,follow=False)
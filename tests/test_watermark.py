@@ -0,0 +1,122 @@
+"""
+Module Test Watermark
+
+This module contains test functions for the per-site watermarks of incremental crawls.
+
+Functions:
+- test_category(): Checks that the pages of a category share its key.
+- test_watermark_runs(): Checks that a page is recognized as crawled from the watermark of the previous run.
+- test_spider_stops_at_watermark(): Checks that the spider stops paginating at a page crawled by a previous run.
+- test_watermark_dates(): Checks that dates are compared as datetimes.
+- test_watermark_local_dates(): Checks that dates without a timezone are compared in local time.
+- test_watermark_without_follow(): Checks that a spider that does not follow pages advances the watermark.
+"""
+import time
+import pytest
+from falcon.Records import MappedData
+from falcon.Site import MainSite
+from falcon.Watermark import Watermark, category
+from scrapy import Request
+from scrapy.http import HtmlResponse
+from test_item_fields import html
+
+@pytest.fixture
+def local_time(monkeypatch):
+    """
+    Sets the local timezone of the test, restoring it afterwards.
+    """
+    def set_timezone(name):
+        monkeypatch.setenv('TZ', name)
+        time.tzset()
+    yield set_timezone
+    monkeypatch.undo()
+    time.tzset()
+
+def record(link, date):
+    return MappedData('Listing', [('PublishLink', str, link), ('PublishDate', str, date)])
+
+def test_category():
+    """
+    This test function checks that the pages of a category share its key.
+    """
+    assert category('https://site.sn/voitures?sort=new&page=3') == 'https://site.sn/voitures?sort=new'
+    assert category('https://site.sn/voitures?page=3&sort=new') == 'https://site.sn/voitures?sort=new'
+    assert category('https://site.sn/voitures/page/3/') == 'https://site.sn/voitures'
+    assert category('https://site.sn/voitures') == 'https://site.sn/voitures'
+
+def test_watermark_runs(tmp_path):
+    """
+    This test function checks that pages are compared to the watermark of the previous run,
+    and that the links of the run are persisted first.
+    """
+    first = Watermark('site', keep=3, directory=str(tmp_path))
+    page1 = [record('https://site.sn/a3', '2024-03-12T10:00:00'), record('https://site.sn/a2', '2024-03-11T10:00:00')]
+    page2 = [record('https://site.sn/a1', '2024-03-10T10:00:00'), record('https://site.sn/a0', '2024-03-09T10:00:00')]
+    assert not first.update('https://site.sn/voitures', page1)
+    assert not first.update('https://site.sn/voitures?page=2', page2)
+    first.save()
+    second = Watermark('site', keep=3, directory=str(tmp_path))
+    assert second.previous['https://site.sn/voitures'] == {
+        'newest': '2024-03-12T10:00:00', 'links': {'https://site.sn/a3', 'https://site.sn/a2', 'https://site.sn/a1'}}
+    fresh = [record('https://site.sn/a4', '2024-03-13T10:00:00'), record('https://site.sn/a3', '2024-03-12T10:00:00')]
+    assert not second.update('https://site.sn/voitures', fresh)
+    assert second.update('https://site.sn/voitures?page=2', page1)
+    assert second.update('https://site.sn/voitures?page=3', [record('https://site.sn/b0', '2024-03-01T10:00:00')])
+    assert not second.update('https://site.sn/motos', page1)
+    assert not second.update('https://site.sn/voitures?page=4', [])
+    second.save()
+    assert Watermark('site', keep=3, directory=str(tmp_path))._persisted['https://site.sn/voitures'] == {
+        'newest': '2024-03-13T10:00:00', 'links': ['https://site.sn/a4', 'https://site.sn/a3', 'https://site.sn/a2']}
+
+def test_spider_stops_at_watermark(tmp_path):
+    """
+    This test function checks that the spider stops paginating at a page crawled by a previous run.
+    """
+    body = f'<html><body>{html}<a class="next" href="/voitures?page=2">Suivant</a></body></html>'
+    response = HtmlResponse(url='https://site.sn/voitures', body=body, encoding='utf-8')
+    requests = []
+    for run in range(2):
+        spider = MainSite('site', [response.url], window=2, watermark=Watermark('site', directory=str(tmp_path))).spider()
+        requests.append([output.url for output in spider.parse(response) if isinstance(output, Request)])
+        spider.closed('finished')
+    assert requests == [['https://site.sn/voitures?page=2', 'https://site.sn/voitures?page=3'], []]
+
+def test_watermark_dates(tmp_path, local_time):
+    """
+    This test function checks that dates are compared as datetimes rather than strings, across formats and timezones.
+    """
+    local_time('UTC')
+    first = Watermark('site', directory=str(tmp_path))
+    first.update('https://site.sn/voitures', [
+        record('https://site.sn/a1', '2024-03-12T10:00:00+01:00'), record('https://site.sn/a0', '2024-03-12T09:30:00')])
+    assert first.current['https://site.sn/voitures']['newest'] == '2024-03-12T09:30:00'
+    first.save()
+    second = Watermark('site', directory=str(tmp_path))
+    assert second.update('https://site.sn/voitures?page=2', [record('https://site.sn/b0', '2024-03-12T11:00:00+03:00')])
+    assert not second.update('https://site.sn/voitures?page=3', [record('https://site.sn/b1', '2024-03-12T09:45:00')])
+    assert not second.update('https://site.sn/voitures?page=4', [record('https://site.sn/b2', 'hier')])
+
+def test_watermark_local_dates(tmp_path, local_time):
+    """
+    This test function checks that dates without a timezone are read in local time, so they are compared
+    with dates with a timezone in UTC.
+    """
+    local_time('Etc/GMT-2')
+    first = Watermark('site', directory=str(tmp_path))
+    first.update('https://site.sn/voitures', [record('https://site.sn/a0', '2024-03-12T10:00:00')])
+    first.save()
+    second = Watermark('site', directory=str(tmp_path))
+    assert second.update('https://site.sn/voitures?page=2', [record('https://site.sn/b0', '2024-03-12T07:30:00Z')])
+    assert not second.update('https://site.sn/voitures?page=3', [record('https://site.sn/b1', '2024-03-12T08:30:00Z')])
+    assert second.update('https://site.sn/voitures?page=4', [record('https://site.sn/b2', '2024-03-12T09:30:00')])
+
+def test_watermark_without_follow(tmp_path):
+    """
+    This test function checks that a spider that does not follow the next pages still advances the watermark.
+    """
+    body = f'<html><body>{html}</body></html>'
+    response = HtmlResponse(url='https://site.sn/voitures', body=body, encoding='utf-8')
+    spider = MainSite('site', [response.url], follow=False, watermark=Watermark('site', directory=str(tmp_path))).spider()
+    assert not [output for output in spider.parse(response) if isinstance(output, Request)]
+    spider.closed('finished')
+    assert Watermark('site', directory=str(tmp_path)).previous['https://site.sn/voitures']['links']
@@ -0,0 +1,100 @@
+"""
+Module Test Workers
+
+This module contains test functions for the pre-fork pool of page parsing workers.
+
+Functions:
+- test_pool_parse(): Checks that workers return the records and next page of the page parsed in process.
+- test_record_pickle(): Checks that records are pickled by their name and fields.
+- test_shared_memory_transport(): Checks the records of bodies sent through shared memory.
+- test_full_ring(): Checks that bodies are pickled while every slot is in use, and that failed sends free their slot.
+- test_spider_offload(): Checks that a spider with a pool yields the items and next page parsed by the workers.
+"""
+import pickle
+import pytest
+from falcon.Page import MainPage
+from falcon.Item import MainItem
+from falcon.Records import MappedData
+from falcon.Site import MainSite, MultipleSites
+from falcon.Workers import ParsePool
+from scrapy import Request, Selector
+from scrapy.http import HtmlResponse
+from scrapy.utils.reactor import install_reactor, is_reactor_installed
+from test_item_fields import html
+
+body = f'<html><body>{html * 3}<a class="next" href="?page=2">Suivant</a></body></html>'
+
+def test_pool_parse():
+    """
+    This test function checks that the workers return the records of the page parsed in process and the absolute next page URL.
+    """
+    expected = [item.to_dict() for item in MainPage(Selector(text=body))]
+    with ParsePool(workers=2) as pool:
+        records, next_url = pool.parse(body.encode(), 'https://www.test-site.com/annonces')
+        pages = pool.map([(body, 'https://www.test-site.com/annonces')] * 2, fields=['PublishLink'])
+    assert [{**record.to_dict(), 'CreatedAt': None} for record in records] == [{**item, 'CreatedAt': None} for item in expected]
+    assert next_url == 'https://www.test-site.com/annonces?page=2'
+    assert [[record.to_dict()['PublishLink'] for record in page[0]] for page in pages] == [[item['PublishLink'] for item in expected]] * 2
+    sites = MultipleSites([], parse_workers=1)
+    assert sites.pool is sites.pool
+    sites.pool.close()
+
+def test_record_pickle():
+    """
+    This test function checks that a record is rebuilt on the shared record type when unpickled.
+    """
+    record = MainItem.parse(Selector(text=html))
+    copy = pickle.loads(pickle.dumps(record))
+    assert copy.to_dict() == record.to_dict()
+    assert type(copy.dataclass) is type(record.dataclass)
+
+def test_shared_memory_transport():
+    """
+    This test function checks that bodies sent through shared memory give the records of pickled bodies and free their slots.
+    """
+    with ParsePool(workers=2, shared_memory=True, slots=2, slot_size=1 << 16) as pool:
+        pages = pool.map([(body.encode(), 'https://www.test-site.com/annonces')] * 5 + [(body * 20, '')])
+        assert pool.ring.name.startswith(('psm_', 'wnsm_'))
+        assert pool.ring._free.qsize() == 2
+    expected = [item.to_dict()['PublishLink'] for item in MainPage(Selector(text=body))]
+    assert all([record.to_dict()['PublishLink'] for record in records] == expected for records, _ in pages[:5])
+    assert pages[0][1] == 'https://www.test-site.com/annonces?page=2'
+    assert len(pages[5][0]) == 60
+    assert MappedData.unpack(MappedData.pack([])) == []
+
+def test_full_ring():
+    """
+    This test function checks that bodies are pickled rather than waited for while every slot is in use,
+    and that the slot of a body whose sending fails is freed.
+    """
+    with ParsePool(workers=1, shared_memory=True, slots=1, slot_size=1 << 16) as pool:
+        held = pool.ring.acquire(b'held')
+        records, next_url = pool.parse(body.encode(), 'https://www.test-site.com/annonces')
+        assert next_url == 'https://www.test-site.com/annonces?page=2' and len(records) == 3
+        pool.ring.release(held[0])
+        apply_async, pool._pool.apply_async = pool._pool.apply_async, None
+        with pytest.raises(TypeError):
+            pool.parse_async(body.encode())
+        pool._pool.apply_async = apply_async
+        assert pool.ring._free.qsize() == 1
+
+def test_spider_offload():
+    """
+    This test function checks that a spider with a pool yields the items and the next page parsed by the workers,
+    and that a pool is not combined with a selector profile.
+    """
+    if not is_reactor_installed():
+        install_reactor('twisted.internet.asyncioreactor.AsyncioSelectorReactor')
+    from twisted.internet import reactor
+    response = HtmlResponse(url='https://www.test-site.com/annonces', body=body, encoding='utf-8')
+    expected = [item.to_dict()['PublishLink'] for item in MainPage(Selector(text=body))]
+    with ParsePool(workers=1) as pool:
+        spider = MainSite('site', [response.url], pool=pool).spider()
+        async def crawl():
+            return [output async for output in spider.parse(response)]
+        # The callbacks of the pool reach the spider through the reactor, whose event loop runs the parse.
+        outputs = reactor._asyncioEventloop.run_until_complete(crawl())
+        with pytest.raises(ValueError):
+            MainSite('site', [response.url], pool=pool, profile=True)
+    assert [output['PublishLink'] for output in outputs[:-1]] == expected
+    assert isinstance(outputs[-1], Request) and outputs[-1].url == 'https://www.test-site.com/annonces?page=2'